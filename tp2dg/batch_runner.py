@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import os
+import time
+
+from google.genai import types
+
+from .data.loader import get_sessions
+from .conversation_orchestrator import ConversationOrchestrator
+
+DONE_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Generate conversations for every dummy session, batching the profile/goal calls (Gemini Batch API).")
+    p.add_argument("--model", type=str, default="gemini-2.5-flash", help="Gemini model name")
+    p.add_argument("--output-dir", type=str, default="generated_conversations", help="Output directory")
+    p.add_argument("--turns", type=int, default=4, help="Number of turns")
+    p.add_argument("--poll-interval", type=float, default=30.0, help="Seconds between batch status checks")
+    return p.parse_args()
+
+
+def to_content(contents: list) -> types.Content:
+    parts = []
+    for part in contents:
+        if isinstance(part, str):
+            parts.append(types.Part.from_text(text=part))
+        else:
+            parts.append(types.Part.from_uri(file_uri=part.uri, mime_type=part.mime_type))
+    return types.Content(role="user", parts=parts)
+
+
+def run_batch(client, model: str, requests: list[list], display_name: str, poll_interval: float) -> list[str]:
+    # Inlined responses come back in request order, so the list index is the request id
+    job = client.batches.create(
+        model=model,
+        src=[{"contents": [to_content(contents)]} for contents in requests],
+        config={"display_name": display_name},
+    )
+    while job.state.name not in DONE_STATES:
+        time.sleep(poll_interval)
+        job = client.batches.get(name=job.name)
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        raise RuntimeError(f"Batch job {job.name} ended with state {job.state.name}")
+    return [(r.response.text or "") if r.response else "" for r in job.dest.inlined_responses]
+
+
+def main():
+    args = parse_args()
+
+    def session_dir(sess):
+        return os.path.join(args.output_dir, args.model, "dummy", sess.user["user_id"], sess.session_id)
+
+    # Sessions with a finished chat.json come from an earlier run
+    sessions = [sess for sess in get_sessions() if not os.path.exists(os.path.join(session_dir(sess), "chat.json"))]
+    if not sessions:
+        print("All conversations already exist")
+        return
+
+    orch = ConversationOrchestrator(model=args.model, seed=42)
+    uploads = [orch.upload_artifacts(sess.liked_tracks, sess.pool_tracks) for sess in sessions]
+    requests = []
+    for sess, (audio_files, image_files) in zip(sessions, uploads):
+        requests.append(orch.profile_llm.build_contents(sess.liked_tracks, audio_files, image_files))
+        requests.append(orch.conversation_goal_llm.build_contents(sess.pool_tracks, audio_files, image_files, seed=42))
+    responses = run_batch(orch.shared_client, args.model, requests, display_name="tp2dg-profile-goal", poll_interval=args.poll_interval)
+
+    # The chat turns depend on each other's replies, so they still run as regular chat sessions
+    for i, sess in enumerate(sessions):
+        out_dir = session_dir(sess)
+        outputs = asyncio.run(
+            orch.generate(
+                user=sess.user,
+                liked=sess.liked_tracks,
+                pool=sess.pool_tracks,
+                num_turns=args.turns,
+                listener_profile=orch.profile_llm.parse_profile(responses[2 * i]),
+                conversation_goal=orch.conversation_goal_llm.parse_conversation_goal(responses[2 * i + 1]),
+            )
+        )
+        orch.save_outputs(outputs, out_dir)
+        print(f"Saved conversation to: {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import os
 
 from .data.loader import get_first_session
@@ -10,6 +11,7 @@ def parse_args():
     p.add_argument("--model", type=str, default="gemini-2.5-flash", help="Gemini model name")
     p.add_argument("--output-dir", type=str, default="generated_conversations", help="Output directory")
     p.add_argument("--turns", type=int, default=4, help="Number of turns")
+    p.add_argument("--context-cache", action="store_true", help="Serve turn-0 chat history from a Gemini context cache")
     return p.parse_args()
 
 
@@ -18,10 +20,14 @@ def main():
 
     sess = get_first_session()
 
-    orch = ConversationOrchestrator(model=args.model, seed=42)
-    outputs = orch.generate(user=sess.user, liked=sess.liked_tracks, pool=sess.pool_tracks, num_turns=args.turns)
-
     out_dir = os.path.join(args.output_dir, args.model, "dummy", sess.user["user_id"], sess.session_id)
+    if os.path.exists(os.path.join(out_dir, "chat.json")):
+        print(f"Conversation already exists, skipping: {out_dir}")
+        return
+
+    orch = ConversationOrchestrator(model=args.model, seed=42, use_context_cache=args.context_cache)
+    outputs = asyncio.run(orch.generate(user=sess.user, liked=sess.liked_tracks, pool=sess.pool_tracks, num_turns=args.turns))
+
     orch.save_outputs(outputs, out_dir)
     print(f"Saved conversation to: {out_dir}")
 
@@ -0,0 +1,14 @@
+import functools
+import os
+
+from google import genai
+from google.genai import types
+
+# Matches the longest call_with_timeout budget, so a hung request also frees its worker thread
+HTTP_TIMEOUT_MS = 180_000
+
+
+@functools.lru_cache(maxsize=1)
+def shared_client() -> genai.Client:
+	# One client per process so every orchestrator and evaluator reuses the same HTTP connection pool
+	return genai.Client(api_key=os.environ.get("GEMINI_API_KEY"), http_options=types.HttpOptions(timeout=HTTP_TIMEOUT_MS))
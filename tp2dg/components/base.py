@@ -1,7 +1,7 @@
-import time
-
 from google import genai
 
+from tp2dg.components.rate_limit import API_RATE_LIMITER
+
 
 class BaseComponent:
 	def __init__(self, api_delay: float = 0.0):
@@ -14,5 +14,4 @@ class BaseComponent:
 		return self.client
 
 	def wait_for_rate_limit(self):
-		if self.api_delay > 0:
-			time.sleep(self.api_delay) 
\ No newline at end of file
+		API_RATE_LIMITER.acquire() 
\ No newline at end of file
@@ -0,0 +1,171 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "tp2dg")
+# Uploaded files expire after ~48h; stop reusing them a little early so a conversation never outlives its files
+UPLOAD_EXPIRY_MARGIN = 3600
+
+
+def cache_enabled() -> bool:
+	return os.environ.get("TP2DG_CACHE") == "1"
+
+
+def canonicalize_contents(contents: Any) -> list[str]:
+	# Uploaded files are keyed by content hash (remote name as fallback) so keys survive re-uploads
+	if not isinstance(contents, (list, tuple)):
+		contents = [contents]
+	canonical = []
+	for part in contents:
+		if isinstance(part, str):
+			canonical.append(part)
+		elif getattr(part, "sha256_hash", None):
+			canonical.append(f"file-sha256:{part.sha256_hash}")
+		elif getattr(part, "name", None):
+			canonical.append(f"file:{part.name}")
+		else:
+			canonical.append(repr(part))
+	return canonical
+
+
+def prompt_hash(contents: Any, model: str = "") -> str:
+	h = hashlib.blake2b(model.encode("utf-8"), digest_size=32)
+	for part in canonicalize_contents(contents):
+		h.update(b"\x00")
+		h.update(part.encode("utf-8"))
+	return h.hexdigest()
+
+
+def prompt_fingerprint(contents: Any) -> dict:
+	# Logged in place of the full multimodal prompt, which is large and already reproducible from the inputs
+	return {"prompt_hash": prompt_hash(contents), "prompt_len": len(contents)}
+
+
+@dataclass
+class CachedResponse:
+	text: str
+	usage_metadata: dict | None = None
+
+	def to_json_dict(self) -> dict:
+		return {"usage_metadata": self.usage_metadata}
+
+
+def cached_call(namespace: str):
+	"""Cache a `generate_content`-style call on disk, keyed by its `model` and `contents` keyword arguments.
+
+	Enabled only when `TP2DG_CACHE=1`. Cached responses expose `.text` and `.to_json_dict()`,
+	which is all the components read from a response.
+	"""
+
+	def decorator(func):
+		@functools.wraps(func)
+		def wrapper(*args, model: str, contents: Any, **kwargs):
+			if not cache_enabled():
+				return func(*args, model=model, contents=contents, **kwargs)
+			path = _entry_path(namespace, prompt_hash(contents, model))
+			payload = _read_entry(path)
+			if payload is not None:
+				return CachedResponse(**payload)
+			response = func(*args, model=model, contents=contents, **kwargs)
+			if response is not None and response.text:
+				_write_entry(path, {"text": response.text, "usage_metadata": response.to_json_dict().get("usage_metadata")})
+			return response
+
+		return wrapper
+
+	return decorator
+
+
+def cached_llm_call(llm_call_func, model: str = "", namespace: str = "evaluation"):
+	"""Wrap an evaluator `llm_call_func(content, client) -> str` coroutine with the on-disk response cache.
+
+	Enabled only when `TP2DG_CACHE=1`. Pass the judge model so different judges do not share entries.
+	"""
+
+	@functools.wraps(llm_call_func)
+	async def wrapper(content, client):
+		if not cache_enabled():
+			return await llm_call_func(content, client)
+		path = _entry_path(namespace, prompt_hash(content, model))
+		payload = _read_entry(path)
+		if payload is not None:
+			return payload["text"]
+		text = await llm_call_func(content, client)
+		if text:
+			_write_entry(path, {"text": text})
+		return text
+
+	return wrapper
+
+
+def _entry_path(namespace: str, key: str) -> str:
+	return os.path.join(CACHE_DIR, namespace, key[:2], f"{key}.json")
+
+
+def _read_entry(path: str) -> dict | None:
+	# An unreadable or truncated entry is treated as a miss, so a broken cache never fails the call
+	try:
+		with open(path, "r", encoding="utf-8") as f:
+			return json.load(f)
+	except (OSError, ValueError):
+		return None
+
+
+def _write_entry(path: str, payload: dict) -> None:
+	try:
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		tmp_path = f"{path}.tmp"
+		with open(tmp_path, "w", encoding="utf-8") as f:
+			json.dump(payload, f, ensure_ascii=False)
+		os.replace(tmp_path, path)
+	except OSError:
+		pass
+
+
+class UploadStore:
+	def __init__(self, path: str):
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		self._lock = threading.Lock()
+		self._conn = sqlite3.connect(path, check_same_thread=False)
+		with self._conn:
+			self._conn.execute("CREATE TABLE IF NOT EXISTS uploads (key TEXT PRIMARY KEY, name TEXT NOT NULL, expires_at REAL)")
+
+	@staticmethod
+	def artifact_key(file_path: str) -> str | None:
+		try:
+			st = os.stat(file_path)
+		except OSError:
+			return None
+		raw = f"{os.path.abspath(file_path)}\x00{st.st_mtime_ns}\x00{st.st_size}"
+		return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+	def get(self, key: str) -> str | None:
+		with self._lock:
+			row = self._conn.execute("SELECT name, expires_at FROM uploads WHERE key = ?", (key,)).fetchone()
+		if row is None:
+			return None
+		name, expires_at = row
+		if expires_at is not None and expires_at < time.time() + UPLOAD_EXPIRY_MARGIN:
+			return None
+		return name
+
+	def put(self, key: str, uploaded_file: Any) -> None:
+		expiration_time = getattr(uploaded_file, "expiration_time", None)
+		expires_at = expiration_time.timestamp() if expiration_time else None
+		with self._lock, self._conn:
+			self._conn.execute("INSERT OR REPLACE INTO uploads (key, name, expires_at) VALUES (?, ?, ?)", (key, uploaded_file.name, expires_at))
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_upload_store() -> UploadStore:
+	return UploadStore(os.path.join(CACHE_DIR, "uploads.db"))
+
+
+def upload_store() -> UploadStore | None:
+	return _shared_upload_store() if cache_enabled() else None
@@ -2,18 +2,24 @@ from google import genai
 from google.genai import types
 
 from tp2dg.components.base import BaseComponent
-from tp2dg.components.utils import extract_detailed_token_usage
+from tp2dg.components.cache import prompt_fingerprint
+from tp2dg.components.rate_limit import call_with_retries
+from tp2dg.components.utils import collect_stream, extract_detailed_token_usage
 from tp2dg.entities.token_usage import TokenUsage
 from tp2dg.entities.track import Tracks
 from tp2dg.prompts.listener_llm.system import listener_system, listener_turn_0
 from tp2dg.prompts.recsys_llm.system import recsys_system, recsys_turn_0_pt1, recsys_turn_0_pt2
 
+CONTEXT_CACHE_TTL = "3600s"
+
 
 class ChatSessionManager(BaseComponent):
-	def __init__(self, client: genai.Client, model: str):
+	def __init__(self, client: genai.Client, model: str, use_context_cache: bool = False):
 		super().__init__()
 		self.client = client
 		self.model = model
+		self.use_context_cache = use_context_cache
+		self.context_caches = []
 		self.recsys_interactions = []
 		self.listener_interactions = []
 		self.profiling_interactions = []
@@ -41,11 +47,13 @@ class ChatSessionManager(BaseComponent):
 		)
 		turn0_pt2_prompt = recsys_turn_0_pt2.format()
 		turn0_contents = [turn0_pt1_prompt, *available_tracks_contents, turn0_pt2_prompt]
-		recsys_response = self.recsys_chat.send_message(turn0_contents)
+		recsys_response_text, recsys_response = call_with_retries(lambda: collect_stream(self.recsys_chat.send_message_stream(turn0_contents)))
 		recsys_token_usage = extract_detailed_token_usage(recsys_response)
 		self.recsys_interactions.append(
-			{"turn": 0, "type": "system_initialization_with_audio", "prompt": str(turn0_contents), "response": recsys_response.text if recsys_response else "No response", "token_usage": recsys_token_usage.to_dict(), "total_tracks_analyzed": len(recommendation_pool)},
+			{"turn": 0, "type": "system_initialization_with_audio", **prompt_fingerprint(turn0_contents), "response": recsys_response_text if recsys_response else "No response", "token_usage": recsys_token_usage.to_dict(), "total_tracks_analyzed": len(recommendation_pool)},
 		)
+		if self.use_context_cache:
+			self.recsys_chat = self._move_history_to_context_cache(self.recsys_chat, recsys_system_instruction)
 
 	def initialize_listener_session(self, listener_profile, conversation_goal, previously_liked_tracks: Tracks, uploaded_audio_files=None, uploaded_image_files=None):
 		if uploaded_audio_files is None:
@@ -68,11 +76,33 @@ class ChatSessionManager(BaseComponent):
 				tracks_artifacts=artifacts, include_track_id=True, tracks_title="## Your Previously Liked Tracks\n\n"
 			)
 			contents = [*liked_tracks_contents, listener_turn_0.format()]
-			listener_response = self.listener_chat.send_message(contents)
+			listener_response_text, listener_response = call_with_retries(lambda: collect_stream(self.listener_chat.send_message_stream(contents)))
 			listener_token_usage = extract_detailed_token_usage(listener_response)
 			self.listener_interactions.append(
-				{"turn": 0, "type": "previously_liked_tracks", "prompt": str(liked_tracks_contents), "response": listener_response.text if listener_response else "No response", "token_usage": listener_token_usage.to_dict()},
+				{"turn": 0, "type": "previously_liked_tracks", **prompt_fingerprint(contents), "response": listener_response_text if listener_response else "No response", "token_usage": listener_token_usage.to_dict()},
+			)
+			if self.use_context_cache:
+				self.listener_chat = self._move_history_to_context_cache(self.listener_chat, listener_system_instruction)
+
+	def _move_history_to_context_cache(self, chat, system_instruction: str):
+		# Freeze the turn-0 exchange (track pool / liked tracks) into an explicit cache so each later turn
+		# is billed for its own message only; keep the plain chat if caching is unavailable (e.g. too few tokens)
+		try:
+			cache = self.client.caches.create(
+				model=self.model,
+				config=types.CreateCachedContentConfig(contents=chat.get_history(), system_instruction=system_instruction, ttl=CONTEXT_CACHE_TTL),
 			)
+		except Exception:
+			return chat
+		self.context_caches.append(cache.name)
+		return self.client.chats.create(model=self.model, config=types.GenerateContentConfig(cached_content=cache.name))
+
+	def release_context_caches(self) -> None:
+		while self.context_caches:
+			try:
+				self.client.caches.delete(name=self.context_caches.pop())
+			except Exception:
+				pass
 
 	def get_all_interactions(self) -> dict[str, list]:
 		return {
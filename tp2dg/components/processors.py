@@ -1,20 +1,28 @@
+import concurrent.futures
 import os
-from typing import Any, Optional
+import threading
+from typing import Any, Iterable, Optional
 
 from google import genai
 
 from tp2dg.components.base import BaseComponent
+from tp2dg.components.cache import upload_store
 from tp2dg.components.utils import call_with_timeout
-from tp2dg.entities.track import Tracks
+from tp2dg.entities.track import Track
 
 
 class BaseFileProcessor(BaseComponent):
+	# Shared across processors so uploads reuse worker threads instead of spawning a pool per batch
+	_upload_executor = concurrent.futures.ThreadPoolExecutor(max_workers=16, thread_name_prefix="file-upload")
+
 	def __init__(self, client: genai.Client, base_path: str, modality: str):
 		super().__init__()
 		self.client = client
 		self.base_path = base_path
 		self.modality = modality
 		self._conversation_cache = {}
+		self._path_cache = {}
+		self._cache_lock = threading.Lock()
 
 	def get_cache_key(self, track_id: str) -> str:
 		return f"{track_id}-{self.modality}"
@@ -25,22 +33,53 @@ class BaseFileProcessor(BaseComponent):
 	def prepare_file(self, file_path: str) -> str:
 		return file_path
 
+	def artifact_exists(self, file_path: str, track_id: str) -> bool:
+		cache_key = self.get_cache_key(track_id)
+		exists = self._path_cache.get(cache_key)
+		if exists is None:
+			exists = self._path_cache[cache_key] = os.path.exists(file_path)
+		return exists
+
 	def upload_file(self, file_path: str, track_id: str) -> Any:
 		cache_key = self.get_cache_key(track_id)
-		if cache_key in self._conversation_cache:
-			return self._conversation_cache[cache_key]
-		uploaded_file = call_with_timeout(lambda: self.client.files.upload(file=file_path), timeout=60)
-		self._conversation_cache[cache_key] = uploaded_file
-		return uploaded_file
+		with self._cache_lock:
+			if cache_key in self._conversation_cache:
+				return self._conversation_cache[cache_key]
+		uploaded_file = None
+		store = upload_store()
+		store_key = store.artifact_key(file_path) if store else None
+		if store_key:
+			# Reuse an upload from an earlier run while it is still live on the server
+			name = store.get(store_key)
+			if name:
+				try:
+					uploaded_file = call_with_timeout(lambda: self.client.files.get(name=name), timeout=60)
+				except Exception:
+					uploaded_file = None
+		if uploaded_file is None:
+			uploaded_file = call_with_timeout(lambda: self.client.files.upload(file=file_path), timeout=60)
+			if store_key:
+				store.put(store_key, uploaded_file)
+		with self._cache_lock:
+			return self._conversation_cache.setdefault(cache_key, uploaded_file)
 
-	def batch_upload_tracks(self, tracks: Tracks) -> dict[str, Any]:
-		track_files = {}
+	def batch_upload_tracks(self, tracks: Iterable[Track]) -> dict[str, Any]:
+		# Deduplicate first so a track shared by liked and pool is stat'ed and uploaded once
+		paths = {}
 		for track in tracks:
-			path = track.get_artifact_path(self.modality, self.base_path)
-			if os.path.exists(path):
-				uploaded = self.upload_file(path, track.track_id)
-				if uploaded:
-					track_files[track.track_id] = uploaded
+			if track.track_id not in paths:
+				paths[track.track_id] = track.get_artifact_path(self.modality, self.base_path)
+		exists = dict(zip(paths, self._upload_executor.map(self.artifact_exists, paths.values(), paths.keys())))
+		futures = {
+			self._upload_executor.submit(self.upload_file, path, track_id): track_id
+			for track_id, path in paths.items()
+			if exists[track_id]
+		}
+		track_files = {}
+		for future in concurrent.futures.as_completed(futures):
+			uploaded = future.result()
+			if uploaded:
+				track_files[futures[future]] = uploaded
 		return track_files
 
 
@@ -52,4 +91,4 @@ class AudioProcessor(BaseFileProcessor):
 
 class ImageProcessor(BaseFileProcessor):
 	def __init__(self, client: genai.Client, image_base_path: str):
-		super().__init__(client, image_base_path, "image") 
\ No newline at end of file
+		super().__init__(client, image_base_path, "image")
@@ -3,6 +3,7 @@ from typing import Any
 from google import genai
 
 from tp2dg.components.base import BaseComponent
+from tp2dg.components.cache import cached_call
 from tp2dg.components.utils import call_with_timeout, extract_detailed_token_usage, robust_parse_yaml_response
 from tp2dg.entities import ConversationGoal
 from tp2dg.entities.reponse_code import ListenerProfileCode
@@ -23,12 +24,11 @@ class ProfileLLM(BaseComponent):
 	def get_last_token_usage(self) -> TokenUsage:
 		return self.last_token_usage
 
-	def generate_from_tracks(
-		self,
-		listener_tracks: Tracks,
-		uploaded_audio_files: dict[str, Any],
-		uploaded_image_files: dict[str, Any],
-	):
+	@cached_call("profile")
+	def _generate_content(self, *, model: str, contents: list):
+		return self.client.models.generate_content(model=model, contents=contents)
+
+	def build_contents(self, listener_tracks: Tracks, uploaded_audio_files: dict[str, Any], uploaded_image_files: dict[str, Any]) -> list:
 		track_contents = listener_tracks.prompt_str_with_artifacts(
 			tracks_artifacts={"audio": uploaded_audio_files, "image": uploaded_image_files},
 			include_track_id=False,
@@ -39,14 +39,10 @@ class ProfileLLM(BaseComponent):
 			gender=self.profile_information["gender"],
 			preferred_language=self.profile_information["preferred_language"],
 		)
-		contents = [inference_prompt, *track_contents]
-		response = call_with_timeout(
-			lambda: self.client.models.generate_content(model=self.model, contents=contents),
-			timeout=120,
-		)
-		self.last_prompt = str(contents)
-		self.last_token_usage = extract_detailed_token_usage(response)
-		parsed = robust_parse_yaml_response(response.text, profile_query.response_expected_fields)
+		return [inference_prompt, *track_contents]
+
+	def parse_profile(self, response_text: str):
+		parsed = robust_parse_yaml_response(response_text, profile_query.response_expected_fields)
 		from tp2dg.entities.listener_profile import ListenerProfile
 		return ListenerProfile(
 			age_group=self.profile_information["age_group"],
@@ -58,4 +54,19 @@ class ProfileLLM(BaseComponent):
 			top_1_genre=parsed.get("top_1_genre", "Unknown"),
 			success=True,
 			code=ListenerProfileCode.SUCCESS,
-		) 
\ No newline at end of file
+		)
+
+	def generate_from_tracks(
+		self,
+		listener_tracks: Tracks,
+		uploaded_audio_files: dict[str, Any],
+		uploaded_image_files: dict[str, Any],
+	):
+		contents = self.build_contents(listener_tracks, uploaded_audio_files, uploaded_image_files)
+		response = call_with_timeout(
+			lambda: self._generate_content(model=self.model, contents=contents),
+			timeout=120,
+		)
+		self.last_prompt = contents[0]
+		self.last_token_usage = extract_detailed_token_usage(response)
+		return self.parse_profile(response.text)
\ No newline at end of file
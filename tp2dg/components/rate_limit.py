@@ -0,0 +1,53 @@
+import random
+import threading
+import time
+
+from google.genai import errors
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+	def __init__(self, rate_per_sec: float = 0.0, burst: int = 1):
+		self._lock = threading.Lock()
+		self.configure(rate_per_sec, burst)
+
+	def configure(self, rate_per_sec: float, burst: int = 1) -> None:
+		with self._lock:
+			self.rate_per_sec = rate_per_sec
+			self.burst = max(1, burst)
+			self._tokens = float(self.burst)
+			self._updated = time.monotonic()
+
+	def acquire(self) -> None:
+		# A non-positive rate disables limiting
+		while self.rate_per_sec > 0:
+			with self._lock:
+				now = time.monotonic()
+				self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_sec)
+				self._updated = now
+				if self._tokens >= 1:
+					self._tokens -= 1
+					return
+				wait = (1 - self._tokens) / self.rate_per_sec
+			time.sleep(wait)
+
+
+# Shared by every component so the limit applies to the process, not to each caller
+API_RATE_LIMITER = TokenBucket()
+
+
+def is_retryable(error: Exception) -> bool:
+	return isinstance(error, errors.APIError) and error.code in RETRYABLE_STATUS_CODES
+
+
+def call_with_retries(func, max_attempts: int = 5, initial_delay: float = 1.0, max_delay: float = 30.0):
+	for attempt in range(max_attempts):
+		API_RATE_LIMITER.acquire()
+		try:
+			return func()
+		except Exception as e:
+			if attempt == max_attempts - 1 or not is_retryable(e):
+				raise
+			# Full jitter keeps concurrent callers from retrying in lockstep after a 429
+			time.sleep(random.uniform(0, min(max_delay, initial_delay * 2**attempt)))
@@ -1,16 +1,52 @@
 import concurrent.futures
+import functools
+import json
 import re
+from typing import Any
 
+import yaml
+
+from tp2dg.components.rate_limit import call_with_retries
 from tp2dg.entities.token_usage import TokenUsage
 
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-call")
+
+# BaseLoader keeps every scalar as a string (no yes/no -> bool or 00123 -> int coercion)
+_YAML_LOADER = getattr(yaml, "CBaseLoader", yaml.BaseLoader)
+
+_FENCE_RE = re.compile(r"```\w*\n?")
+_WS_RE = re.compile(r"\s+")
+_QUOTE_RE = re.compile(r'^["\']|["\']$')
+_CHOICE_RE = re.compile(r"(?i)choice\s*[:=]\s*(\d+)")
+_INDEX_RE = re.compile(r"(?i)index\s*(\d+)")
+_NUMBER_RE = re.compile(r"\b(\d+)\b")
+# A value token starting with a YAML tag (!), anchor (&) or alias (*) indicator, which YAML would consume or reject
+_YAML_NODE_PROPERTY_RE = re.compile(r"(?:^|[:\[\]{},?-])[ \t]*[!&*]", re.MULTILINE)
+# Judge replies are usually nothing but "key: <token>" lines (scores, true/false, quoted class labels);
+# BaseLoader would return those tokens verbatim minus the quotes, so they need no YAML parser
+_SCALAR = r"""(?:\d+|[A-Za-z]\w*|"\w+"|'\w+')"""
+_SCALAR_FIELDS_RE = re.compile(rf"(?:[A-Za-z_]\w*[ \t]*:[ \t]*{_SCALAR}[ \t]*(?:\n+|\Z))+")
+_SCALAR_FIELD_RE = re.compile(r"^([A-Za-z_]\w*)[ \t]*:[ \t]*[\"']?(\w+)", re.MULTILINE)
+
 
 def call_with_timeout(func, timeout=120, *args, **kwargs):
-	with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-		future = executor.submit(func, *args, **kwargs)
-		try:
-			return future.result(timeout=timeout)
-		except concurrent.futures.TimeoutError as e:
-			raise TimeoutError(f"API call timed out after {timeout} seconds") from e
+	# The timeout bounds the whole call, including rate-limit waits and retries
+	future = _EXECUTOR.submit(call_with_retries, functools.partial(func, *args, **kwargs))
+	try:
+		return future.result(timeout=timeout)
+	except concurrent.futures.TimeoutError as e:
+		raise TimeoutError(f"API call timed out after {timeout} seconds") from e
+
+
+def collect_stream(stream) -> tuple[str, Any]:
+	# Drain a streamed response; the final chunk carries the usage metadata for the whole call
+	parts = []
+	last_chunk = None
+	for chunk in stream:
+		if chunk.text:
+			parts.append(chunk.text)
+		last_chunk = chunk
+	return "".join(parts), last_chunk
 
 
 def extract_detailed_token_usage(response) -> TokenUsage:
@@ -50,16 +86,72 @@ def extract_detailed_token_usage(response) -> TokenUsage:
 		return TokenUsage()
 
 
+@functools.lru_cache(maxsize=128)
+def _key_patterns(keys: tuple[str, ...]) -> list[tuple[str, tuple[re.Pattern, re.Pattern], re.Pattern]]:
+	return [
+		(
+			key,
+			(re.compile(rf"^{re.escape(key)}\s*:", re.MULTILINE), re.compile(rf"{re.escape(key)}\s*:")),
+			re.compile(rf"^{re.escape(key)}\s*:\s*(.+)", re.MULTILINE | re.DOTALL),
+		)
+		for key in keys
+	]
+
+
+def _parse_scalar_fields(clean_text: str, expected_keys: list[str]) -> dict[str, str] | None:
+	if not _SCALAR_FIELDS_RE.fullmatch(clean_text):
+		return None
+	fields = dict(_SCALAR_FIELD_RE.findall(clean_text))
+	try:
+		return {key: fields[key] for key in expected_keys}
+	except KeyError:
+		return None
+
+
+def _parse_structured_response(clean_text: str, expected_keys: list[str]) -> dict[str, str] | None:
+	fast = _parse_scalar_fields(clean_text, expected_keys)
+	if fast is not None:
+		return fast
+	try:
+		parsed = json.loads(clean_text)
+	except ValueError:
+		# YAML would silently drop " #..." as a comment, which free-text fields may legitimately contain
+		if "#" in clean_text:
+			return None
+		# Likewise "!important ..." would be read as a tag and dropped; leave such text to the regex scanner
+		if _YAML_NODE_PROPERTY_RE.search(clean_text):
+			return None
+		try:
+			parsed = yaml.load(clean_text, Loader=_YAML_LOADER)
+		except yaml.YAMLError:
+			return None
+	if not isinstance(parsed, dict):
+		return None
+	result = {}
+	for key in expected_keys:
+		value = parsed.get(key)
+		if value is None or isinstance(value, (dict, list)):
+			return None
+		value = _WS_RE.sub(" ", str(value)).strip()
+		if not value:
+			return None
+		result[key] = value
+	return result
+
+
 def robust_parse_yaml_response(text: str, expected_keys: list[str]) -> dict[str, str]:
 	result = {}
-	clean_text = re.sub(r"```\w*\n?", "", text)
-	clean_text = re.sub(r"\n```", "", clean_text)
-	clean_text = clean_text.strip()
+	# Closing fences are consumed by the same pattern, so one pass strips every fence
+	clean_text = _FENCE_RE.sub("", text).strip()
+	structured = _parse_structured_response(clean_text, expected_keys)
+	if structured is not None:
+		return structured
 	key_positions = []
-	for key in expected_keys:
-		patterns = [rf"^{re.escape(key)}\s*:", rf"{re.escape(key)}\s*:"]
-		for pattern in patterns:
-			match = re.search(pattern, clean_text, re.MULTILINE)
+	value_patterns = {}
+	for key, position_patterns, value_pattern in _key_patterns(tuple(expected_keys)):
+		value_patterns[key] = value_pattern
+		for pattern in position_patterns:
+			match = pattern.search(clean_text)
 			if match:
 				key_positions.append((match.start(), key))
 				break
@@ -70,36 +162,28 @@ def robust_parse_yaml_response(text: str, expected_keys: list[str]) -> dict[str,
 			section = clean_text[start_pos:end_pos]
 		else:
 			section = clean_text[start_pos:]
-		key_pattern = rf"^{re.escape(key)}\s*:\s*(.+)"
-		match = re.search(key_pattern, section, re.MULTILINE | re.DOTALL)
+		match = value_patterns[key].search(section)
 		if match:
 			value = match.group(1).strip()
-			value = re.sub(r'^["\']|["\']$', "", value)
-			lines = value.split("\n")
-			processed_lines = []
-			for line in lines:
-				line = line.strip()
-				if line:
-					processed_lines.append(line)
-			value = " ".join(processed_lines)
-			value = re.sub(r"\s+", " ", value).strip()
+			value = _QUOTE_RE.sub("", value)
+			value = _WS_RE.sub(" ", value).strip()
 			if value:
 				result[key] = value
 	return result
 
 
 def parse_recsys_choice_index(text: str, max_index: int) -> int:
-	m = re.search(r"(?i)choice\s*[:=]\s*(\d+)", text)
+	m = _CHOICE_RE.search(text)
 	if m:
 		idx = int(m.group(1))
 		return min(max(idx, 0), max_index)
-	m = re.search(r"(?i)index\s*(\d+)", text)
+	m = _INDEX_RE.search(text)
 	if m:
 		idx = int(m.group(1))
 		return min(max(idx, 0), max_index)
 	for line in text.splitlines():
-		m = re.search(r"\b(\d+)\b", line)
+		m = _NUMBER_RE.search(line)
 		if m:
 			idx = int(m.group(1))
 			return min(max(idx, 0), max_index)
-	return 0 
\ No newline at end of file
+	return 0
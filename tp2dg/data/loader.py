@@ -1,6 +1,8 @@
+import functools
 import json
 import os
 from dataclasses import dataclass
+from sys import intern
 from typing import Dict, List, Tuple
 
 from tp2dg.entities.track import Track, Tracks
@@ -9,7 +11,7 @@ from tp2dg.entities.track import Track, Tracks
 DATA_DIR = os.path.join(os.path.dirname(__file__), "dummy")
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionData:
 	user: Dict
 	liked_tracks: Tracks
@@ -22,34 +24,56 @@ def _read_json(path: str):
 		return json.load(f)
 
 
-def load_dummy() -> Tuple[Dict, Dict, List[Dict]]:
-	users = _read_json(os.path.join(DATA_DIR, "users.json"))
-	tracks = _read_json(os.path.join(DATA_DIR, "tracks.json"))
-	sessions = _read_json(os.path.join(DATA_DIR, "playlists.json"))
+def _file_stamp(path: str) -> Tuple[str, int, int]:
+	st = os.stat(path)
+	return path, st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=1)
+def _load_dummy_cached(stamps: Tuple[Tuple[str, int, int], ...]) -> Tuple[Dict, Dict, List[Dict]]:
+	users_path, tracks_path, sessions_path = (path for path, _, _ in stamps)
+	users = _read_json(users_path)
+	tracks = _read_json(tracks_path)
+	sessions = _read_json(sessions_path)
 	users_by_id = {u["user_id"]: u for u in users["users"]}
 	tracks_by_id = {t["track_id"]: t for t in tracks["tracks"]}
 	return users_by_id, tracks_by_id, sessions["sessions"]
 
 
+def load_dummy() -> Tuple[Dict, Dict, List[Dict]]:
+	# Keyed on mtime/size so edits to the dummy files are picked up; callers must not mutate the result
+	return _load_dummy_cached(tuple(_file_stamp(os.path.join(DATA_DIR, name)) for name in ("users.json", "tracks.json", "playlists.json")))
+
+
 def _to_track(d: Dict) -> Track:
+	# Artists, albums and tags repeat across the catalog; interning shares one string per value
+	album = d.get("album", "Unknown")
 	return Track(
-		track_id=d["track_id"],
+		track_id=intern(d["track_id"]),
 		title=d["title"],
-		artist=d["artist"],
-		album=d.get("album", "Unknown"),
+		artist=intern(d["artist"]),
+		album=intern(album) if album is not None else None,
 		audio_path=d.get("audio_path"),
 		image_path=d.get("image_path"),
-		tags=d.get("tags", []),
+		tags=tuple(intern(t) for t in d.get("tags") or ()),
 	)
 
 
-def get_first_session(profile_size: int = 3, pool_size: int = 8) -> SessionData:
-	users_by_id, tracks_by_id, sessions = load_dummy()
-	if not sessions:
-		raise RuntimeError("No dummy sessions available")
-	sess = sessions[0]
+def _to_session(sess: Dict, users_by_id: Dict, tracks_by_id: Dict, profile_size: int, pool_size: int) -> SessionData:
 	user = users_by_id[sess["user_id"]]
 	track_ids = [tid for tid in sess["track_ids"] if tid in tracks_by_id]
 	liked = Tracks([_to_track(tracks_by_id[tid]) for tid in track_ids[:profile_size]])
 	pool = Tracks([_to_track(tracks_by_id[tid]) for tid in track_ids[profile_size: profile_size + pool_size]])
-	return SessionData(user=user, liked_tracks=liked, pool_tracks=pool, session_id=sess["session_id"]) 
\ No newline at end of file
+	return SessionData(user=user, liked_tracks=liked, pool_tracks=pool, session_id=sess["session_id"])
+
+
+def get_first_session(profile_size: int = 3, pool_size: int = 8) -> SessionData:
+	users_by_id, tracks_by_id, sessions = load_dummy()
+	if not sessions:
+		raise RuntimeError("No dummy sessions available")
+	return _to_session(sessions[0], users_by_id, tracks_by_id, profile_size, pool_size)
+
+
+def get_sessions(profile_size: int = 3, pool_size: int = 8) -> List[SessionData]:
+	users_by_id, tracks_by_id, sessions = load_dummy()
+	return [_to_session(sess, users_by_id, tracks_by_id, profile_size, pool_size) for sess in sessions]
\ No newline at end of file
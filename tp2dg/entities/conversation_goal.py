@@ -1,3 +1,4 @@
+import itertools
 import os
 import random
 from collections import UserList
@@ -9,8 +10,14 @@ import yaml
 CONVERSATION_GOALS = []
 CONVERSATION_GOALS_YAML_PATH = os.path.join(os.path.dirname(__file__), "conversation_goals.yaml")
 
+# libyaml's CSafeLoader parses the goals YAML several times faster than the pure-Python SafeLoader
 with open(CONVERSATION_GOALS_YAML_PATH) as f:
-	CONVERSATION_GOALS = yaml.safe_load(f)
+	CONVERSATION_GOALS = yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+# (category, specificity) -> goal; setdefault keeps the first entry, as the old linear scan did
+_GOAL_INDEX = {}
+for _goal in CONVERSATION_GOALS:
+	_GOAL_INDEX.setdefault((_goal["category"]["code"], _goal["specificity"]["code"]), _goal)
 
 
 class ConversationGoalCategoryCode(Enum):
@@ -44,7 +51,18 @@ class ConversationGoalSpecificityCode(Enum):
 		return [c for c in cls if c.name != "UNKNOWN"]
 
 
-@dataclass
+# Plain dicts skip Enum.__call__'s value lookup machinery when coercing model output
+_CATEGORY_BY_VALUE = {c.value: c for c in ConversationGoalCategoryCode}
+_SPECIFICITY_BY_VALUE = {s.value: s for s in ConversationGoalSpecificityCode}
+
+_SELECTABLE_PAIRS = tuple(
+	(c, s)
+	for c in ConversationGoalCategoryCode.get_selectable_codes()
+	for s in ConversationGoalSpecificityCode.get_selectable_codes()
+)
+
+
+@dataclass(slots=True)
 class ConversationGoal:
 	category_code: ConversationGoalCategoryCode
 	category_description: str
@@ -68,32 +86,22 @@ class ConversationGoal:
 
 	@classmethod
 	def find_conversation_goal(cls, category: str, specificity: str) -> dict:
-		for goal in CONVERSATION_GOALS:
-			if goal["category"]["code"] == category and goal["specificity"]["code"] == specificity:
-				return goal
-		raise ValueError(f"No conversation goal found for category {category} and specificity {specificity}")
+		try:
+			return _GOAL_INDEX[(category, specificity)]
+		except KeyError:
+			raise ValueError(f"No conversation goal found for category {category} and specificity {specificity}") from None
 
 	@classmethod
 	def sample_conversation_goals(cls, seed: int, num_goals: int) -> "ConversationGoals":
 		if num_goals <= 0:
 			raise ValueError(f"Cannot sample {num_goals} goals.")
-		random.seed(seed)
-		selectable = [
-			(c.value, s.value)
-			for c in ConversationGoalCategoryCode.get_selectable_codes()
-			for s in ConversationGoalSpecificityCode.get_selectable_codes()
-		]
-		random.shuffle(selectable)
+		# A local RNG gives the same shuffle as seeding the global one, without clobbering global state
+		selectable = list(_SELECTABLE_PAIRS)
+		random.Random(seed).shuffle(selectable)
 		selected = []
-		for cat, spe in selectable:
-			g = cls.find_conversation_goal(cat, spe)
-			selected.append(
-				ConversationGoal.from_codes(
-					ConversationGoalCategoryCode(cat), ConversationGoalSpecificityCode(spe)
-				),
-			)
-			if len(selected) >= num_goals:
-				break
+		for category_code, specificity_code in itertools.islice(selectable, num_goals):
+			goal = cls.find_conversation_goal(category_code.value, specificity_code.value)
+			selected.append(cls._from_goal_dict(category_code, specificity_code, goal))
 		return ConversationGoals(selected)
 
 	@classmethod
@@ -123,7 +131,24 @@ class ConversationGoal:
 			or specificity_code == ConversationGoalSpecificityCode.UNKNOWN
 		):
 			return cls.unknown_conversation_goal()
-		goal = cls.find_conversation_goal(category_code.value, specificity_code.value)
+		return cls._from_goal_dict(category_code, specificity_code, cls.find_conversation_goal(category_code.value, specificity_code.value))
+
+	@classmethod
+	def from_code_values(cls, category: str, specificity: str) -> "ConversationGoal":
+		try:
+			category_code = _CATEGORY_BY_VALUE[category]
+			specificity_code = _SPECIFICITY_BY_VALUE[specificity]
+		except KeyError:
+			raise ValueError(f"Unknown conversation goal codes: category {category}, specificity {specificity}") from None
+		return cls.from_codes(category_code, specificity_code)
+
+	@classmethod
+	def _from_goal_dict(
+		cls,
+		category_code: ConversationGoalCategoryCode,
+		specificity_code: ConversationGoalSpecificityCode,
+		goal: dict,
+	) -> "ConversationGoal":
 		return cls(
 			category_code=category_code,
 			category_description=goal["category"]["description"],
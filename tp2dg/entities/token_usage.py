@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
 	input_text_tokens: int = 0
 	input_image_tokens: int = 0
@@ -1,10 +1,10 @@
 import os
 from collections import UserList
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Track:
 	track_id: str
 	title: str
@@ -13,29 +13,57 @@ class Track:
 	lyrics: Optional[str] = None
 	audio_path: Optional[str] = None
 	image_path: Optional[str] = None
-	tags: list[str] = None
+	tags: tuple[str, ...] = ()
+	# Rendered prompt_str outputs keyed by their arguments; tracks are not mutated after loading
+	_prompt_cache: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+	_audio_abs: bool = field(default=False, init=False, repr=False, compare=False)
+	_image_abs: bool = field(default=False, init=False, repr=False, compare=False)
+
+	def __post_init__(self):
+		self._audio_abs = bool(self.audio_path) and os.path.isabs(self.audio_path)
+		self._image_abs = bool(self.image_path) and os.path.isabs(self.image_path)
 
 	def get_artifact_path(self, modality: str, base_path: str) -> str:
 		if modality == "audio":
-			p = self.audio_path or ""
+			p, is_abs = self.audio_path or "", self._audio_abs
 		elif modality == "image":
-			p = self.image_path or ""
+			p, is_abs = self.image_path or "", self._image_abs
 		else:
 			raise NotImplementedError(f"Modality {modality} not implemented")
-		return p if os.path.isabs(p) else os.path.join(base_path, p)
+		return p if is_abs else os.path.join(base_path, p)
 
 	def prompt_str(self, include_track_id: bool, title="### TRACK:\n", lyric_chars: int = 100, n_tags: int = 10) -> str:
-		track_id_str = f" track_id: {self.track_id}\n" if include_track_id else "\n"
-		lyrics = ""
+		key = (include_track_id, title, lyric_chars, n_tags)
+		cache = self._prompt_cache
+		if cache is None:
+			cache = self._prompt_cache = {}
+		elif key in cache:
+			return cache[key]
+		tags = self.tags
+		if not tags:
+			tags_str = ""
+		elif n_tags is None or len(tags) <= n_tags:
+			tags_str = ", ".join(tags)
+		else:
+			tags_str = ", ".join(tags[:n_tags])
+		# Byte-for-byte the published prompt format, including the double space before track_id
+		parts = [
+			title,
+			"- Title: ",
+			self.title,
+			f"  track_id: {self.track_id}\n" if include_track_id else " \n",
+			"- Artist: ",
+			self.artist,
+			"\n- Album: ",
+			self.album or "Unknown",
+			"\n- Tags: ",
+			tags_str,
+		]
 		if lyric_chars and self.lyrics:
-			dotdotdot = "..." if len(self.lyrics) > lyric_chars else ""
-			lyrics = f"\nLyrics: --- Begin of Lyrics ---\n{self.lyrics[:lyric_chars]}{dotdotdot}--- End of Lyrics ---\n"
-		tags = ", ".join((self.tags or [])[: n_tags if n_tags is not None else len(self.tags or [])])
-		album = self.album or "Unknown"
-		return f"""{title}- Title: {self.title} {track_id_str}- Artist: {self.artist}
-- Album: {album}
-- Tags: {tags}{lyrics}
-"""
+			parts += ("\nLyrics: --- Begin of Lyrics ---\n", self.lyrics[:lyric_chars], "..." if len(self.lyrics) > lyric_chars else "", "--- End of Lyrics ---\n")
+		parts.append("\n")
+		cache[key] = out = "".join(parts)
+		return out
 
 	def prompt_str_with_artifacts(
 		self,
@@ -62,7 +90,7 @@ class Track:
 			lyrics=data.get("lyrics"),
 			audio_path=data.get("audio_path"),
 			image_path=data.get("image_path"),
-			tags=data.get("tags", []),
+			tags=tuple(data.get("tags") or ()),
 		)
 
 	def to_dict(self) -> dict:
@@ -74,7 +102,7 @@ class Track:
 			"lyrics": self.lyrics,
 			"audio_path": self.audio_path,
 			"image_path": self.image_path,
-			"tags": self.tags or [],
+			"tags": list(self.tags or ()),
 		}
 
 
@@ -90,13 +118,14 @@ class Tracks(UserList):
 	) -> list[Any]:
 		if tracks_artifacts is None:
 			tracks_artifacts = {}
+		# Transpose modality -> track_id -> file into track_id -> modality -> file once, instead of probing every modality per track
+		per_track = {}
+		for modality, uploaded_files in tracks_artifacts.items():
+			for track_id, file_object in uploaded_files.items():
+				per_track.setdefault(track_id, {})[modality] = file_object
 		contents = [tracks_title]
-		for track in self:
-			track_artifacts = {}
-			for modality, uploaded_files in tracks_artifacts.items():
-				if track.track_id in uploaded_files:
-					track_artifacts[modality] = uploaded_files[track.track_id]
-			track_kwargs = dict(kwargs)
-			track_kwargs["track_artifacts"] = track_artifacts
-			contents.extend(track.prompt_str_with_artifacts(**track_kwargs))
+		extend = contents.extend
+		artifacts_for = per_track.get
+		for track in self.data:
+			extend(track.prompt_str_with_artifacts(track_artifacts=artifacts_for(track.track_id), **kwargs))
 		return contents 
\ No newline at end of file
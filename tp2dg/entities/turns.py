@@ -5,7 +5,7 @@ from tp2dg.entities.reponse_code import ListenerTurnCode, RecsysTurnCode
 from tp2dg.entities.track import Track
 
 
-@dataclass
+@dataclass(slots=True)
 class ListenerTurn:
 	turn_number: int
 	prompt: str
@@ -18,7 +18,7 @@ class ListenerTurn:
 	VALID_GOAL_PROGRESS_ASSESSMENT = ["MOVES_TOWARD_GOAL", "DOES_NOT_MOVE_TOWARD_GOAL"]
 
 
-@dataclass
+@dataclass(slots=True)
 class RecsysTurn:
 	turn_number: int
 	prompt: str
@@ -29,7 +29,7 @@ class RecsysTurn:
 	code: str = RecsysTurnCode.SUCCESS
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationTurn:
 	turn_number: int
 	listener_turn: ListenerTurn
@@ -37,25 +37,92 @@ class ConversationTurn:
 
 
 class ConversationTurns(list):
+	def __init__(self, turns=()):
+		super().__init__()
+		self._used_ids = []
+		self.extend(turns)
+
+	def _sync_used_ids(self) -> None:
+		self._used_ids = [turn.recsys_turn.track.track_id for turn in self if turn.recsys_turn.track is not None]
+
+	def append(self, turn: ConversationTurn) -> None:
+		super().append(turn)
+		if turn.recsys_turn.track is not None:
+			self._used_ids.append(turn.recsys_turn.track.track_id)
+
+	def extend(self, turns) -> None:
+		for turn in turns:
+			self.append(turn)
+
+	def __iadd__(self, turns):
+		self.extend(turns)
+		return self
+
+	# Adding at the end keeps _used_ids in O(1); any other change to the turns rebuilds it
+	def insert(self, index, turn: ConversationTurn) -> None:
+		super().insert(index, turn)
+		self._sync_used_ids()
+
+	def __setitem__(self, index, value) -> None:
+		super().__setitem__(index, value)
+		self._sync_used_ids()
+
+	def __delitem__(self, index) -> None:
+		super().__delitem__(index)
+		self._sync_used_ids()
+
+	def __imul__(self, n):
+		super().__imul__(n)
+		self._sync_used_ids()
+		return self
+
+	def pop(self, index=-1) -> ConversationTurn:
+		turn = super().pop(index)
+		self._sync_used_ids()
+		return turn
+
+	def remove(self, turn: ConversationTurn) -> None:
+		super().remove(turn)
+		self._sync_used_ids()
+
+	def clear(self) -> None:
+		super().clear()
+		self._used_ids = []
+
+	def sort(self, *args, **kwargs) -> None:
+		super().sort(*args, **kwargs)
+		self._sync_used_ids()
+
+	def reverse(self) -> None:
+		super().reverse()
+		self._sync_used_ids()
+
 	def used_track_ids(self) -> list[str]:
-		return [turn.recsys_turn.track.track_id for turn in self if turn.recsys_turn.track is not None]
+		# A copy, so callers cannot desync the running list
+		return list(self._used_ids)
 
 	def to_list_of_dicts(self) -> list[dict]:
-		return [
-			{
-				"turn_number": tr.turn_number,
-				"listener_turn": {
-					"prompt": tr.listener_turn.prompt,
-					"thought": tr.listener_turn.thought,
-					"goal_progress_assessment": tr.listener_turn.goal_progress_assessment,
-					"message": tr.listener_turn.message,
-				},
-				"recsys_turn": {
-					"prompt": tr.recsys_turn.prompt,
-					"thought": tr.recsys_turn.thought,
-					"track": tr.recsys_turn.track.__dict__ if tr.recsys_turn.track else None,
-					"message": tr.recsys_turn.message,
-				},
-			}
-			for tr in self
-		] 
\ No newline at end of file
+		out = []
+		append = out.append
+		for tr in self:
+			lt = tr.listener_turn
+			rt = tr.recsys_turn
+			track = rt.track
+			append(
+				{
+					"turn_number": tr.turn_number,
+					"listener_turn": {
+						"prompt": lt.prompt,
+						"thought": lt.thought,
+						"goal_progress_assessment": lt.goal_progress_assessment,
+						"message": lt.message,
+					},
+					"recsys_turn": {
+						"prompt": rt.prompt,
+						"thought": rt.thought,
+						"track": track.to_dict() if track else None,
+						"message": rt.message,
+					},
+				}
+			)
+		return out
\ No newline at end of file
@@ -7,12 +7,14 @@ given the conversation goal and actual progress made.
 
 import json
 import logging
+from collections import Counter
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
 from tp2dg.evaluation.prompts.utils import (
-	extract_conversation_turns,
+	conversation_goal_json,
+	conversation_turns_json,
 	extract_goal_progress_assessments,
 	get_recommended_tracks_content,
 )
@@ -95,12 +97,10 @@ class GoalProgressAssessmentEvaluator(BaseEvaluationTemplate):
 			uploaded_image_files = {}
 
 		# Extract conversation goal
-		conversation_goal = chat_json["conversation_goal"]
-		goal_text = json.dumps(conversation_goal)
+		goal_text = conversation_goal_json(chat_json)
 
 		# Extract conversation turns using utility function
-		conversation_turns = extract_conversation_turns(chat_json)
-		turns_text = json.dumps(conversation_turns)
+		turns_text = conversation_turns_json(chat_json)
 
 		recommended_tracks_content = get_recommended_tracks_content(
 			chat_json,
@@ -138,7 +138,7 @@ class GoalProgressAssessmentEvaluator(BaseEvaluationTemplate):
 		# Get prompt data with uploaded files
 		prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-		content = self.prompt_template.format(**prompt_data)
+		content = self.prompt_template.format_map(prompt_data)
 
 		# Call LLM
 		response = await llm_call_func(content, client)
@@ -158,12 +158,11 @@ class GoalProgressAssessmentEvaluator(BaseEvaluationTemplate):
 			return {
 				"accuracy_score": score,
 				"success": score > 0 and score <= 4,
-				"raw_response": response,
-				"parsed_response": parsed,
+				**self._raw_fields(response, parsed),
 			}
 
 		except Exception as e:
-			logging.error(f"Error parsing response: {e}")
+			logging.error("Error parsing response: %s", e)
 			return {
 				"accuracy_score": 0,
 				"success": False,
@@ -172,34 +171,47 @@ class GoalProgressAssessmentEvaluator(BaseEvaluationTemplate):
 			}
 
 	def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-		"""Aggregate individual results into summary statistics."""
-
-		successful_results = [r for r in individual_results if r.get("success", False)]
-
-		if not successful_results:
+		"""Aggregate individual results into summary statistics.
+
+		The raw per-conversation scores are only included when keep_raw is set.
+		"""
+
+		# One pass counts successes, sums their scores and builds the distribution
+		scores = [] if self.keep_raw else None
+		counts = Counter()
+		n_total = 0
+		n_success = 0
+		total = 0
+		for r in individual_results:
+			n_total += 1
+			if r.get("success", False):
+				score = r["accuracy_score"]
+				n_success += 1
+				total += score
+				counts[score] += 1
+				if scores is not None:
+					scores.append(score)
+
+		if not n_success:
 			return {
-				"total_conversations": len(individual_results),
+				"total_conversations": n_total,
 				"successful_evaluations": 0,
 				"average_score": 0.0,
 				"score_distribution": {},
 				"success_rate": 0.0,
 			}
 
-		scores = [r["accuracy_score"] for r in successful_results]
-
-		# Calculate distribution
-		score_distribution = {i: scores.count(i) for i in range(1, 5)}
-
-		return {
-			"total_conversations": len(individual_results),
-			"successful_evaluations": len(successful_results),
-			"average_score": sum(scores) / len(scores),
-			"score_distribution": score_distribution,
-			"success_rate": len(successful_results) / len(individual_results),
-			"scores": scores,  # For further analysis
+		results = {
+			"total_conversations": n_total,
+			"successful_evaluations": n_success,
+			"average_score": total / n_success,
+			"score_distribution": {i: counts.get(i, 0) for i in range(1, 5)},
+			"success_rate": n_success / n_total,
 		}
+		if scores is not None:
+			results["scores"] = scores  # For further analysis
+		return results
 
 
 # Create the evaluator instance for easy import
 goal_progress_assessment_evaluator = GoalProgressAssessmentEvaluator()
- 
\ No newline at end of file
@@ -5,13 +5,18 @@ This module evaluates message quality for both Listener and Recsys,
 including naturalness, realism, consistency, and performance aspects.
 """
 
-import json
 import logging
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import extract_conversation_turns, get_recommended_tracks_content
+from tp2dg.evaluation.prompts.utils import (
+	conversation_goal_json,
+	conversation_turns_json,
+	get_recommended_tracks_content,
+	listener_profile_json,
+	summarize_scores,
+)
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 message_evaluation_prompt = PromptTemplate(
@@ -141,16 +146,13 @@ class MessageEvaluator(BaseEvaluationTemplate):
 			uploaded_image_files = {}
 
 		# Extract conversation goal
-		conversation_goal = chat_json["conversation_goal"]
-		goal_text = json.dumps(conversation_goal)
+		goal_text = conversation_goal_json(chat_json)
 
 		# Extract conversation turns using utility function
-		conversation_turns = extract_conversation_turns(chat_json)
-		turns_text = json.dumps(conversation_turns)
+		turns_text = conversation_turns_json(chat_json)
 
 		# Extract listener profile
-		listener_profile = chat_json["listener_profile"]
-		profile_text = json.dumps(listener_profile)
+		profile_text = listener_profile_json(chat_json)
 
 		recommended_tracks_content = get_recommended_tracks_content(
 			chat_json,
@@ -184,7 +186,7 @@ class MessageEvaluator(BaseEvaluationTemplate):
 		# Get prompt data with uploaded files
 		prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-		content = self.prompt_template.format(**prompt_data)
+		content = self.prompt_template.format_map(prompt_data)
 
 		# Call LLM
 		response = await llm_call_func(content, client)
@@ -196,45 +198,18 @@ class MessageEvaluator(BaseEvaluationTemplate):
 				self.prompt_template.response_expected_fields,
 			)
 
-			# Extract all scores
-			listener_quality_score = parsed["listener_quality_score"]
-			recsys_quality_score = parsed["recsys_quality_score"]
-			listener_helpfulness_score = parsed["listener_helpfulness_score"]
-			recsys_accuracy_score = parsed["recsys_accuracy_score"]
-
-			# Convert to int if needed
-			if isinstance(listener_quality_score, str):
-				listener_quality_score = int(listener_quality_score)
-			if isinstance(recsys_quality_score, str):
-				recsys_quality_score = int(recsys_quality_score)
-			if isinstance(listener_helpfulness_score, str):
-				listener_helpfulness_score = int(listener_helpfulness_score)
-			if isinstance(recsys_accuracy_score, str):
-				recsys_accuracy_score = int(recsys_accuracy_score)
-
-			# Check if all scores are valid
-			all_scores_valid = all(
-				0 < score <= 4
-				for score in [
-					listener_quality_score,
-					recsys_quality_score,
-					listener_helpfulness_score,
-					recsys_accuracy_score,
-				]
-			)
+			# Extract all scores; int() also accepts scores the YAML parser already returned as ints
+			scores = {field: int(parsed[field]) for field in self.prompt_template.response_expected_fields}
+			all_scores_valid = 0 < min(scores.values()) and max(scores.values()) <= 4
 
 			return {
-				"listener_quality_score": listener_quality_score,
-				"recsys_quality_score": recsys_quality_score,
-				"listener_helpfulness_score": listener_helpfulness_score,
-				"recsys_accuracy_score": recsys_accuracy_score,
+				**scores,
 				"success": all_scores_valid,
-				"raw_response": response,
-				"parsed_response": parsed,
+				**self._raw_fields(response, parsed),
 			}
 
 		except Exception as e:
-			logging.error(f"Error parsing response: {e}")
+			logging.error("Error parsing response: %s", e)
 			return {
 				"listener_quality_score": 0,
 				"recsys_quality_score": 0,
@@ -246,11 +221,25 @@ class MessageEvaluator(BaseEvaluationTemplate):
 			}
 
 	def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-		"""Aggregate individual results into summary statistics."""
-
-		successful_results = [r for r in individual_results if r.get("success", False)]
-
-		if not successful_results:
+		"""Aggregate individual results into summary statistics.
+
+		The raw per-conversation scores are only included when keep_raw is set.
+		"""
+
+		# One pass splits the successful results into per-metric score lists
+		listener_quality_scores = []
+		recsys_quality_scores = []
+		listener_helpfulness_scores = []
+		recsys_accuracy_scores = []
+		for r in individual_results:
+			if r.get("success", False):
+				listener_quality_scores.append(r["listener_quality_score"])
+				recsys_quality_scores.append(r["recsys_quality_score"])
+				listener_helpfulness_scores.append(r["listener_helpfulness_score"])
+				recsys_accuracy_scores.append(r["recsys_accuracy_score"])
+		n_success = len(listener_quality_scores)
+
+		if not n_success:
 			return {
 				"total_conversations": len(individual_results),
 				"successful_evaluations": 0,
@@ -263,45 +252,42 @@ class MessageEvaluator(BaseEvaluationTemplate):
 				},
 			}
 
-		# Extract all scores
-		listener_quality_scores = [r["listener_quality_score"] for r in successful_results]
-		recsys_quality_scores = [r["recsys_quality_score"] for r in successful_results]
-		listener_helpfulness_scores = [r["listener_helpfulness_score"] for r in successful_results]
-		recsys_accuracy_scores = [r["recsys_accuracy_score"] for r in successful_results]
-
-		# Calculate distributions
-		listener_quality_dist = {i: listener_quality_scores.count(i) for i in range(1, 5)}
-		recsys_quality_dist = {i: recsys_quality_scores.count(i) for i in range(1, 5)}
-		listener_helpfulness_dist = {i: listener_helpfulness_scores.count(i) for i in range(1, 5)}
-		recsys_accuracy_dist = {i: recsys_accuracy_scores.count(i) for i in range(1, 5)}
+		# Calculate averages and distributions
+		listener_quality_avg, listener_quality_dist = summarize_scores(listener_quality_scores)
+		recsys_quality_avg, recsys_quality_dist = summarize_scores(recsys_quality_scores)
+		listener_helpfulness_avg, listener_helpfulness_dist = summarize_scores(listener_helpfulness_scores)
+		recsys_accuracy_avg, recsys_accuracy_dist = summarize_scores(recsys_accuracy_scores)
 
-		return {
+		results = {
 			"total_conversations": len(individual_results),
-			"successful_evaluations": len(successful_results),
-			"success_rate": len(successful_results) / len(individual_results),
+			"successful_evaluations": n_success,
+			"success_rate": n_success / len(individual_results),
 			"metrics": {
 				"listener_quality": {
-					"average_score": sum(listener_quality_scores) / len(listener_quality_scores),
+					"average_score": listener_quality_avg,
 					"score_distribution": listener_quality_dist,
-					"scores": listener_quality_scores,
 				},
 				"recsys_quality": {
-					"average_score": sum(recsys_quality_scores) / len(recsys_quality_scores),
+					"average_score": recsys_quality_avg,
 					"score_distribution": recsys_quality_dist,
-					"scores": recsys_quality_scores,
 				},
 				"listener_helpfulness": {
-					"average_score": sum(listener_helpfulness_scores) / len(listener_helpfulness_scores),
+					"average_score": listener_helpfulness_avg,
 					"score_distribution": listener_helpfulness_dist,
-					"scores": listener_helpfulness_scores,
 				},
 				"recsys_accuracy": {
-					"average_score": sum(recsys_accuracy_scores) / len(recsys_accuracy_scores),
+					"average_score": recsys_accuracy_avg,
 					"score_distribution": recsys_accuracy_dist,
-					"scores": recsys_accuracy_scores,
 				},
 			},
 		}
+		if self.keep_raw:
+			metrics = results["metrics"]
+			metrics["listener_quality"]["scores"] = listener_quality_scores
+			metrics["recsys_quality"]["scores"] = recsys_quality_scores
+			metrics["listener_helpfulness"]["scores"] = listener_helpfulness_scores
+			metrics["recsys_accuracy"]["scores"] = recsys_accuracy_scores
+		return results
 
 
 # Create the evaluator instance for easy import
@@ -5,13 +5,12 @@ This module evaluates thought coherence and helpfulness for both Listener and Re
 assessing if thoughts explain the actual thought process and align with messages.
 """
 
-import json
 import logging
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import extract_conversation_turns
+from tp2dg.evaluation.prompts.utils import conversation_turns_json, summarize_scores
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 thought_evaluation_prompt = PromptTemplate(
@@ -91,8 +90,7 @@ class ThoughtEvaluator(BaseEvaluationTemplate):
         """Prepare data for the thought evaluation prompt."""
 
         # Extract conversation turns using utility function
-        conversation_turns = extract_conversation_turns(chat_json)
-        turns_text = json.dumps(conversation_turns)
+        turns_text = conversation_turns_json(chat_json)
 
         return {
             "conversation_turns": turns_text,
@@ -111,7 +109,7 @@ class ThoughtEvaluator(BaseEvaluationTemplate):
         # Get prompt data with uploaded files
         prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-        content = self.prompt_template.format(**prompt_data)
+        content = self.prompt_template.format_map(prompt_data)
 
         # Call LLM
         response = await llm_call_func(content, client)
@@ -123,29 +121,18 @@ class ThoughtEvaluator(BaseEvaluationTemplate):
                 self.prompt_template.response_expected_fields,
             )
 
-            # Extract both scores
-            listener_coherence_score = parsed["listener_coherence_score"]
-            recsys_coherence_score = parsed["recsys_coherence_score"]
-
-            # Convert to int if needed
-            if isinstance(listener_coherence_score, str):
-                listener_coherence_score = int(listener_coherence_score)
-            if isinstance(recsys_coherence_score, str):
-                recsys_coherence_score = int(recsys_coherence_score)
-
-            # Check if all scores are valid
-            all_scores_valid = all(0 < score <= 4 for score in [listener_coherence_score, recsys_coherence_score])
+            # Extract both scores; int() also accepts scores the YAML parser already returned as ints
+            scores = {field: int(parsed[field]) for field in self.prompt_template.response_expected_fields}
+            all_scores_valid = 0 < min(scores.values()) and max(scores.values()) <= 4
 
             return {
-                "listener_coherence_score": listener_coherence_score,
-                "recsys_coherence_score": recsys_coherence_score,
+                **scores,
                 "success": all_scores_valid,
-                "raw_response": response,
-                "parsed_response": parsed,
+                **self._raw_fields(response, parsed),
             }
 
         except Exception as e:
-            logging.error(f"Error parsing response: {e}")
+            logging.error("Error parsing response: %s", e)
             return {
                 "listener_coherence_score": 0,
                 "recsys_coherence_score": 0,
@@ -155,11 +142,21 @@ class ThoughtEvaluator(BaseEvaluationTemplate):
             }
 
     def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-        """Aggregate individual results into summary statistics."""
+        """Aggregate individual results into summary statistics.
 
-        successful_results = [r for r in individual_results if r.get("success", False)]
+        The raw per-conversation scores are only included when keep_raw is set.
+        """
 
-        if not successful_results:
+        # One pass splits the successful results into per-metric score lists
+        listener_coherence_scores = []
+        recsys_coherence_scores = []
+        for r in individual_results:
+            if r.get("success", False):
+                listener_coherence_scores.append(r["listener_coherence_score"])
+                recsys_coherence_scores.append(r["recsys_coherence_score"])
+        n_success = len(listener_coherence_scores)
+
+        if not n_success:
             return {
                 "total_conversations": len(individual_results),
                 "successful_evaluations": 0,
@@ -170,31 +167,30 @@ class ThoughtEvaluator(BaseEvaluationTemplate):
                 },
             }
 
-        # Extract all scores
-        listener_coherence_scores = [r["listener_coherence_score"] for r in successful_results]
-        recsys_coherence_scores = [r["recsys_coherence_score"] for r in successful_results]
-
-        # Calculate distributions
-        listener_coherence_dist = {i: listener_coherence_scores.count(i) for i in range(1, 5)}
-        recsys_coherence_dist = {i: recsys_coherence_scores.count(i) for i in range(1, 5)}
+        # Calculate averages and distributions
+        listener_coherence_avg, listener_coherence_dist = summarize_scores(listener_coherence_scores)
+        recsys_coherence_avg, recsys_coherence_dist = summarize_scores(recsys_coherence_scores)
 
-        return {
+        results = {
             "total_conversations": len(individual_results),
-            "successful_evaluations": len(successful_results),
-            "success_rate": len(successful_results) / len(individual_results),
+            "successful_evaluations": n_success,
+            "success_rate": n_success / len(individual_results),
             "metrics": {
                 "listener_coherence": {
-                    "average_score": sum(listener_coherence_scores) / len(listener_coherence_scores),
+                    "average_score": listener_coherence_avg,
                     "score_distribution": listener_coherence_dist,
-                    "scores": listener_coherence_scores,
                 },
                 "recsys_coherence": {
-                    "average_score": sum(recsys_coherence_scores) / len(recsys_coherence_scores),
+                    "average_score": recsys_coherence_avg,
                     "score_distribution": recsys_coherence_dist,
-                    "scores": recsys_coherence_scores,
                 },
             },
         }
+        if self.keep_raw:
+            metrics = results["metrics"]
+            metrics["listener_coherence"]["scores"] = listener_coherence_scores
+            metrics["recsys_coherence"]["scores"] = recsys_coherence_scores
+        return results
 
 
 # Create the evaluator instance for easy import
@@ -5,13 +5,17 @@ This module evaluates recommendation quality and progress towards goal achieveme
 assessing if the conversation is making progress by recommending relevant tracks.
 """
 
-import json
 import logging
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import extract_conversation_turns, get_recommended_tracks_content
+from tp2dg.evaluation.prompts.utils import (
+    conversation_goal_json,
+    conversation_turns_json,
+    get_recommended_tracks_content,
+    summarize_scores,
+)
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 track_id_recommendation_prompt = PromptTemplate(
@@ -88,12 +92,10 @@ class TrackIdEvaluator(BaseEvaluationTemplate):
             uploaded_image_files = {}
 
         # Extract conversation goal
-        conversation_goal = chat_json["conversation_goal"]
-        goal_text = json.dumps(conversation_goal)
+        goal_text = conversation_goal_json(chat_json)
 
         # Extract conversation turns using utility function
-        conversation_turns = extract_conversation_turns(chat_json)
-        turns_text = json.dumps(conversation_turns)
+        turns_text = conversation_turns_json(chat_json)
 
         recommended_tracks_content = get_recommended_tracks_content(
             chat_json,
@@ -126,7 +128,7 @@ class TrackIdEvaluator(BaseEvaluationTemplate):
         # Get prompt data with uploaded files
         prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-        content = self.prompt_template.format(**prompt_data)
+        content = self.prompt_template.format_map(prompt_data)
 
         # Call LLM
         response = await llm_call_func(content, client)
@@ -146,12 +148,11 @@ class TrackIdEvaluator(BaseEvaluationTemplate):
             return {
                 "recommendation_score": score,
                 "success": score > 0 and score <= 4,
-                "raw_response": response,
-                "parsed_response": parsed,
+                **self._raw_fields(response, parsed),
             }
 
         except Exception as e:
-            logging.error(f"Error parsing response: {e}")
+            logging.error("Error parsing response: %s", e)
             return {
                 "recommendation_score": 0,
                 "success": False,
@@ -160,7 +161,10 @@ class TrackIdEvaluator(BaseEvaluationTemplate):
             }
 
     def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-        """Aggregate individual results into summary statistics."""
+        """Aggregate individual results into summary statistics.
+
+        The raw per-conversation scores are only included when keep_raw is set.
+        """
 
         successful_results = [r for r in individual_results if r.get("success", False)]
 
@@ -175,17 +179,19 @@ class TrackIdEvaluator(BaseEvaluationTemplate):
 
         scores = [r["recommendation_score"] for r in successful_results]
 
-        # Calculate distribution
-        score_distribution = {i: scores.count(i) for i in range(1, 5)}
+        # Calculate average and distribution
+        average_score, score_distribution = summarize_scores(scores)
 
-        return {
+        results = {
             "total_conversations": len(individual_results),
             "successful_evaluations": len(successful_results),
-            "average_score": sum(scores) / len(scores),
+            "average_score": average_score,
             "score_distribution": score_distribution,
             "success_rate": len(successful_results) / len(individual_results),
-            "scores": scores,  # For further analysis
         }
+        if self.keep_raw:
+            results["scores"] = scores  # For further analysis
+        return results
 
 
 # Create the evaluator instance for easy import
@@ -9,6 +9,7 @@ from collections import Counter
 from typing import Any, Optional
 
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
+from tp2dg.evaluation.prompts.utils import counts_to_distribution
 
 
 class ConversationGoalDistributionEvaluator(BaseEvaluationTemplate):
@@ -79,9 +80,30 @@ class ConversationGoalDistributionEvaluator(BaseEvaluationTemplate):
 		As specified in PLAN.md: "Compute the average over Specificity, Category, and Both (combined). Draw histogram."
 		"""
 
-		successful_results = [r for r in individual_results if r.get("success", False)]
-
-		if not successful_results:
+		# One pass counts (specificity, category) pairs and gathers valid target turns;
+		# the per-result raw lists are only kept when asked for
+		pair_counts = Counter()
+		target_turns = []
+		specificities = [] if self.keep_raw else None
+		categories = [] if self.keep_raw else None
+		combined_specs_cats = [] if self.keep_raw else None
+		total_count = 0
+		for r in individual_results:
+			if not r.get("success", False):
+				continue
+			total_count += 1
+			spec = r["specificity"]
+			cat = r["category"]
+			pair_counts[(spec, cat)] += 1
+			turns = r["target_turns"]
+			if isinstance(turns, (int, float)) and turns > 0:
+				target_turns.append(turns)
+			if self.keep_raw:
+				specificities.append(spec)
+				categories.append(cat)
+				combined_specs_cats.append(r["both_combined"])
+
+		if not total_count:
 			return {
 				"total_conversations": len(individual_results),
 				"successful_evaluations": 0,
@@ -92,56 +114,30 @@ class ConversationGoalDistributionEvaluator(BaseEvaluationTemplate):
 				"target_turns_stats": {},
 			}
 
-		# Extract data for analysis
-		specificities = [r["specificity"] for r in successful_results]
-		categories = [r["category"] for r in successful_results]
-		combined_specs_cats = [r["both_combined"] for r in successful_results]
-		target_turns = [
-			r["target_turns"]
-			for r in successful_results
-			if isinstance(r["target_turns"], (int, float)) and r["target_turns"] > 0
-		]
-
-		# Compute distributions (counts and percentages)
-		specificity_counts = Counter(specificities)
-		category_counts = Counter(categories)
-		combined_counts = Counter(combined_specs_cats)
-
-		total_count = len(successful_results)
+		# The per-axis and combined counts are folded from the few distinct pairs
+		specificity_counts = Counter()
+		category_counts = Counter()
+		combined_counts = Counter()
+		for (spec, cat), count in pair_counts.items():
+			specificity_counts[spec] += count
+			category_counts[cat] += count
+			combined_counts[f"{spec}_{cat}"] += count  # same key evaluate_single stores as both_combined
 
 		# Convert to percentage distributions for histogram data
-		specificity_distribution = {
-			spec: {
-				"count": count,
-				"percentage": (count / total_count) * 100,
-			}
-			for spec, count in specificity_counts.items()
-		}
-
-		category_distribution = {
-			cat: {
-				"count": count,
-				"percentage": (count / total_count) * 100,
-			}
-			for cat, count in category_counts.items()
-		}
-
-		combined_distribution = {
-			combo: {
-				"count": count,
-				"percentage": (count / total_count) * 100,
-			}
-			for combo, count in combined_counts.items()
-		}
+		specificity_distribution = counts_to_distribution(specificity_counts, total_count)
+		category_distribution = counts_to_distribution(category_counts, total_count)
+		combined_distribution = counts_to_distribution(combined_counts, total_count)
 
 		# Target turns statistics
 		target_turns_stats = {}
 		if target_turns:
+			# min/max scan the few distinct turn counts rather than the whole list
+			turn_counts = Counter(target_turns)
 			target_turns_stats = {
 				"mean": sum(target_turns) / len(target_turns),
-				"min": min(target_turns),
-				"max": max(target_turns),
-				"distribution": dict(Counter(target_turns)),
+				"min": min(turn_counts),
+				"max": max(turn_counts),
+				"distribution": dict(turn_counts),
 			}
 
 		# Compute "averages" as mentioned in PLAN.md (diversity metrics)
@@ -149,10 +145,10 @@ class ConversationGoalDistributionEvaluator(BaseEvaluationTemplate):
 		category_diversity = len(category_counts)  # Number of unique categories
 		combined_diversity = len(combined_counts)  # Number of unique combinations
 
-		return {
+		results = {
 			"total_conversations": len(individual_results),
-			"successful_evaluations": len(successful_results),
-			"success_rate": len(successful_results) / len(individual_results),
+			"successful_evaluations": total_count,
+			"success_rate": total_count / len(individual_results),
 			# Distribution data (for histograms)
 			"specificity_distribution": specificity_distribution,
 			"category_distribution": category_distribution,
@@ -163,15 +159,17 @@ class ConversationGoalDistributionEvaluator(BaseEvaluationTemplate):
 			"combined_diversity": combined_diversity,
 			# Target turns analysis
 			"target_turns_stats": target_turns_stats,
-			# Raw data for further analysis
-			"raw_specificities": specificities,
-			"raw_categories": categories,
-			"raw_combined": combined_specs_cats,
 			# Summary statistics
 			"most_common_specificity": specificity_counts.most_common(1)[0] if specificity_counts else None,
 			"most_common_category": category_counts.most_common(1)[0] if category_counts else None,
 			"most_common_combination": combined_counts.most_common(1)[0] if combined_counts else None,
 		}
+		if self.keep_raw:
+			# Raw data for further analysis
+			results["raw_specificities"] = specificities
+			results["raw_categories"] = categories
+			results["raw_combined"] = combined_specs_cats
+		return results
 
 
 # Create the evaluator instance for easy import
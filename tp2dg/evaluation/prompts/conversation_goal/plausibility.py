@@ -6,13 +6,12 @@ given the recommendation pool, using the same Track entities and file upload
 system as the data generation process.
 """
 
-import json
 import logging
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import get_recommended_tracks_content
+from tp2dg.evaluation.prompts.utils import conversation_goal_json, get_recommended_tracks_content, summarize_scores
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 conversation_goal_plausibility_prompt = PromptTemplate(
@@ -74,8 +73,7 @@ class ConversationGoalPlausibilityEvaluator(BaseEvaluationTemplate):
 		"""Prepare data for the conversation goal plausibility prompt."""
 
 		# Extract conversation goal
-		conversation_goal = chat_json["conversation_goal"]
-		goal_text = json.dumps(conversation_goal, indent=2)
+		goal_text = conversation_goal_json(chat_json, indent=2)
 
 		recommendation_pool_content = get_recommended_tracks_content(
 			chat_json,
@@ -108,7 +106,7 @@ class ConversationGoalPlausibilityEvaluator(BaseEvaluationTemplate):
 		prompt_data = self.prepare_prompt_data(chat_json, uploaded_audio_files, uploaded_image_files)
 
 		# Create the prompt
-		content = self.prompt_template.format(**prompt_data)
+		content = self.prompt_template.format_map(prompt_data)
 
 		# Call LLM
 		response = await llm_call_func(content, client)
@@ -128,12 +126,11 @@ class ConversationGoalPlausibilityEvaluator(BaseEvaluationTemplate):
 			return {
 				"plausibility_score": score,
 				"success": score > 0 and score <= 4,
-				"raw_response": response,
-				"parsed_response": parsed,
+				**self._raw_fields(response, parsed),
 			}
 
 		except Exception as e:
-			logging.error(f"Error parsing response: {e}")
+			logging.error("Error parsing response: %s", e)
 			return {
 				"plausibility_score": 0,
 				"success": False,
@@ -142,7 +139,10 @@ class ConversationGoalPlausibilityEvaluator(BaseEvaluationTemplate):
 			}
 
 	def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-		"""Aggregate individual results into summary statistics."""
+		"""Aggregate individual results into summary statistics.
+
+		The raw per-conversation scores are only included when keep_raw is set.
+		"""
 
 		successful_results = [r for r in individual_results if r.get("success", False)]
 
@@ -157,17 +157,19 @@ class ConversationGoalPlausibilityEvaluator(BaseEvaluationTemplate):
 
 		scores = [r["plausibility_score"] for r in successful_results]
 
-		# Calculate distribution
-		score_distribution = {i: scores.count(i) for i in range(1, 5)}
+		# Calculate average and distribution
+		average_score, score_distribution = summarize_scores(scores)
 
-		return {
+		results = {
 			"total_conversations": len(individual_results),
 			"successful_evaluations": len(successful_results),
-			"average_score": sum(scores) / len(scores),
+			"average_score": average_score,
 			"score_distribution": score_distribution,
 			"success_rate": len(successful_results) / len(individual_results),
-			"scores": scores,  # For further analysis
 		}
+		if self.keep_raw:
+			results["scores"] = scores  # For further analysis
+		return results
 
 
 # Create the evaluator instance for easy import
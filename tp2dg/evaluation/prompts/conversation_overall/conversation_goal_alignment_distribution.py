@@ -5,13 +5,13 @@ This module evaluates the alignment between the intended conversation goal and t
 classifying conversations into specificity (HH/HL/LH/LL) and category (A/B/C/D/E/F/G/H/I/J/K) classes.
 """
 
-import json
 import logging
+from collections import Counter
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import extract_conversation_turns
+from tp2dg.evaluation.prompts.utils import conversation_goal_json, conversation_turns_json, counts_to_distribution
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 conversation_goal_alignment_prompt = PromptTemplate(
@@ -110,12 +110,10 @@ class ConversationGoalAlignmentEvaluator(BaseEvaluationTemplate):
         """Prepare data for the conversation goal alignment prompt."""
 
         # Extract conversation goal
-        conversation_goal = chat_json["conversation_goal"]
-        goal_text = json.dumps(conversation_goal)
+        goal_text = conversation_goal_json(chat_json)
 
         # Extract conversation turns using utility function
-        conversation_turns = extract_conversation_turns(chat_json)
-        turns_text = json.dumps(conversation_turns)
+        turns_text = conversation_turns_json(chat_json)
 
         return {
             "conversation_goal": goal_text,
@@ -135,7 +133,7 @@ class ConversationGoalAlignmentEvaluator(BaseEvaluationTemplate):
         # Get prompt data with uploaded files
         prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-        content = self.prompt_template.format(**prompt_data)
+        content = self.prompt_template.format_map(prompt_data)
 
         # Call LLM
         response = await llm_call_func(content, client)
@@ -165,12 +163,11 @@ class ConversationGoalAlignmentEvaluator(BaseEvaluationTemplate):
                 "specificity_class": specificity_class,
                 "category_class": category_class,
                 "success": True,
-                "raw_response": response,
-                "parsed_response": parsed,
+                **self._raw_fields(response, parsed),
             }
 
         except Exception as e:
-            logging.error(f"Error parsing response: {e}")
+            logging.error("Error parsing response: %s", e)
             return {
                 "specificity_class": "Unknown",
                 "category_class": "Unknown",
@@ -180,7 +177,10 @@ class ConversationGoalAlignmentEvaluator(BaseEvaluationTemplate):
             }
 
     def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-        """Aggregate individual results into summary statistics."""
+        """Aggregate individual results into summary statistics.
+
+        The per-conversation classifications are only included when keep_raw is set.
+        """
 
         successful_results = [r for r in individual_results if r.get("success", False)]
 
@@ -198,54 +198,44 @@ class ConversationGoalAlignmentEvaluator(BaseEvaluationTemplate):
         specificity_classes = [r.get("specificity_class", "LL") for r in successful_results]
         category_classes = [r.get("category_class", "A") for r in successful_results]
 
-        # Calculate distributions
-        specificity_dist = {}
-        for spec in ["HH", "HL", "LH", "LL"]:
-            count = specificity_classes.count(spec)
-            specificity_dist[spec] = {
-                "count": count,
-                "percentage": count / len(successful_results) * 100,
-            }
+        # Count each axis and every (specificity, category) pair in one pass apiece
+        specificity_counts = Counter(specificity_classes)
+        category_counts = Counter(category_classes)
+        pair_counts = Counter((r.get("specificity_class"), r.get("category_class")) for r in successful_results)
 
-        category_dist = {}
-        for cat in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K"]:
-            count = category_classes.count(cat)
-            category_dist[cat] = {
-                "count": count,
-                "percentage": count / len(successful_results) * 100,
-            }
+        # Calculate distributions
+        n_success = len(successful_results)
+        specificity_dist = counts_to_distribution(specificity_counts, n_success, ["HH", "HL", "LH", "LL"])
+        category_dist = counts_to_distribution(
+            category_counts, n_success, ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K"]
+        )
 
         # Calculate combined distribution
-        combined_dist = {}
-        for spec in ["HH", "HL", "LH", "LL"]:
-            for cat in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K"]:
-                key = f"{spec}-{cat}"
-                count = sum(
-                    1
-                    for r in successful_results
-                    if r.get("specificity_class") == spec and r.get("category_class") == cat
-                )
-                combined_dist[key] = {
-                    "count": count,
-                    "percentage": count / len(successful_results) * 100,
-                }
+        combined_counts = {
+            f"{spec}-{cat}": pair_counts.get((spec, cat), 0)
+            for spec in ["HH", "HL", "LH", "LL"]
+            for cat in ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K"]
+        }
+        combined_dist = counts_to_distribution(combined_counts, n_success)
 
-        return {
+        results = {
             "total_conversations": len(individual_results),
             "successful_evaluations": len(successful_results),
             "success_rate": len(successful_results) / len(individual_results),
             "specificity_distribution": specificity_dist,
             "category_distribution": category_dist,
             "combined_distribution": combined_dist,
-            "individual_results": [
+        }
+        if self.keep_raw:
+            results["individual_results"] = [
                 {
                     "conversation_id": r.get("conversation_id", "unknown"),
                     "specificity_class": r.get("specificity_class"),
                     "category_class": r.get("category_class"),
                 }
                 for r in successful_results
-            ],
-        }
+            ]
+        return results
 
 
 # Create the evaluator instance for easy import
@@ -5,13 +5,12 @@ This module evaluates whether the initial conversation goal is fulfilled or not,
 classifying the conversation outcome as True (fulfilled) or False (not fulfilled).
 """
 
-import json
 import logging
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import extract_conversation_turns, get_recommended_tracks_content
+from tp2dg.evaluation.prompts.utils import conversation_goal_json, conversation_turns_json, get_recommended_tracks_content
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 goal_fulfillment_prompt = PromptTemplate(
@@ -95,12 +94,10 @@ class GoalFulfillmentEvaluator(BaseEvaluationTemplate):
             uploaded_image_files = {}
 
         # Extract conversation goal
-        conversation_goal = chat_json["conversation_goal"]
-        goal_text = json.dumps(conversation_goal)
+        goal_text = conversation_goal_json(chat_json)
 
         # Extract conversation turns using utility function
-        conversation_turns = extract_conversation_turns(chat_json)
-        turns_text = json.dumps(conversation_turns)
+        turns_text = conversation_turns_json(chat_json)
 
         recommended_tracks_content = get_recommended_tracks_content(
             chat_json,
@@ -127,7 +124,7 @@ class GoalFulfillmentEvaluator(BaseEvaluationTemplate):
         # Get prompt data with uploaded files
         prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-        content = self.prompt_template.format(**prompt_data)
+        content = self.prompt_template.format_map(prompt_data)
 
         # Call LLM
         response = await llm_call_func(content, client)
@@ -149,12 +146,11 @@ class GoalFulfillmentEvaluator(BaseEvaluationTemplate):
             return {
                 "goal_fulfilled": goal_fulfilled,
                 "success": True,
-                "raw_response": response,
-                "parsed_response": parsed,
+                **self._raw_fields(response, parsed),
             }
 
         except Exception as e:
-            logging.error(f"Error parsing response: {e}")
+            logging.error("Error parsing response: %s", e)
             return {
                 "goal_fulfilled": False,
                 "success": False,
@@ -5,13 +5,18 @@ This module evaluates how multimodal aspects (audio and image) are correctly con
 by both Listener and Recsys in the conversation, rating as True/False/NotRelevant.
 """
 
-import json
 import logging
+from collections import Counter
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import extract_conversation_turns, get_recommended_tracks_content
+from tp2dg.evaluation.prompts.utils import (
+    conversation_goal_json,
+    conversation_turns_json,
+    counts_to_distribution,
+    get_recommended_tracks_content,
+)
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 multimodality_prompt = PromptTemplate(
@@ -105,12 +110,10 @@ class MultimodalityEvaluator(BaseEvaluationTemplate):
             uploaded_image_files = {}
 
         # Extract conversation goal
-        conversation_goal = chat_json["conversation_goal"]
-        goal_text = json.dumps(conversation_goal)
+        goal_text = conversation_goal_json(chat_json)
 
         # Extract conversation turns using utility function
-        conversation_turns = extract_conversation_turns(chat_json)
-        turns_text = json.dumps(conversation_turns)
+        turns_text = conversation_turns_json(chat_json)
 
         recommended_tracks_content = get_recommended_tracks_content(
             chat_json,
@@ -137,7 +140,7 @@ class MultimodalityEvaluator(BaseEvaluationTemplate):
         # Get prompt data with uploaded files
         prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-        content = self.prompt_template.format(**prompt_data)
+        content = self.prompt_template.format_map(prompt_data)
 
         # Call LLM
         response = await llm_call_func(content, client)
@@ -160,12 +163,11 @@ class MultimodalityEvaluator(BaseEvaluationTemplate):
             return {
                 "multimodal_consideration": multimodal_consideration,
                 "success": True,
-                "raw_response": response,
-                "parsed_response": parsed,
+                **self._raw_fields(response, parsed),
             }
 
         except Exception as e:
-            logging.error(f"Error parsing response: {e}")
+            logging.error("Error parsing response: %s", e)
             return {
                 "multimodal_consideration": "NotRelevant",
                 "success": False,
@@ -174,7 +176,10 @@ class MultimodalityEvaluator(BaseEvaluationTemplate):
             }
 
     def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-        """Aggregate individual results into summary statistics."""
+        """Aggregate individual results into summary statistics.
+
+        The per-conversation classifications are only included when keep_raw is set.
+        """
 
         successful_results = [r for r in individual_results if r.get("success", False)]
 
@@ -187,48 +192,40 @@ class MultimodalityEvaluator(BaseEvaluationTemplate):
                 "classification_distribution": {},
             }
 
-        # Extract classifications
-        classifications = [r.get("multimodal_consideration", "NotRelevant") for r in successful_results]
+        # Count classifications in one pass
+        classification_counts = Counter(r.get("multimodal_consideration", "NotRelevant") for r in successful_results)
 
         # Calculate success rate (True / (True + False))
-        true_count = classifications.count("True")
-        false_count = classifications.count("False")
-        not_relevant_count = classifications.count("NotRelevant")
+        true_count = classification_counts["True"]
+        false_count = classification_counts["False"]
+        not_relevant_count = classification_counts["NotRelevant"]
 
         total_relevant = true_count + false_count
         multimodal_success_rate = true_count / total_relevant if total_relevant > 0 else 0.0
 
         # Calculate distribution
-        classification_dist = {
-            "True": {
-                "count": true_count,
-                "percentage": true_count / len(successful_results) * 100,
-            },
-            "False": {
-                "count": false_count,
-                "percentage": false_count / len(successful_results) * 100,
-            },
-            "NotRelevant": {
-                "count": not_relevant_count,
-                "percentage": not_relevant_count / len(successful_results) * 100,
-            },
-        }
+        classification_dist = counts_to_distribution(
+            {"True": true_count, "False": false_count, "NotRelevant": not_relevant_count},
+            len(successful_results),
+        )
 
-        return {
+        results = {
             "total_conversations": len(individual_results),
             "successful_evaluations": len(successful_results),
             "success_rate": len(successful_results) / len(individual_results),
             "multimodal_success_rate": multimodal_success_rate,
             "classification_distribution": classification_dist,
             "relevant_conversations": total_relevant,
-            "individual_results": [
+        }
+        if self.keep_raw:
+            results["individual_results"] = [
                 {
                     "conversation_id": r.get("conversation_id", "unknown"),
                     "multimodal_consideration": r.get("multimodal_consideration"),
                 }
                 for r in successful_results
-            ],
-        }
+            ]
+        return results
 
 
 # Create the evaluator instance for easy import
@@ -3,9 +3,16 @@ Abstract evaluation template for TalkPlayData 2 evaluation system.
 Defines the structure for LLM judge evaluations and result aggregation.
 """
 
+import asyncio
 import logging
+import os
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Iterable, Optional
+
+from tp2dg.components.cache import cached_llm_call
+
+# Upper bound on in-flight judge calls in evaluate_batch; override per run via the environment
+DEFAULT_MAX_CONCURRENT = int(os.environ.get("EVAL_MAX_CONCURRENT", "64"))
 
 
 class BaseEvaluationTemplate(ABC):
@@ -20,6 +27,9 @@ class BaseEvaluationTemplate(ABC):
 		self.evaluation_name = "base_evaluation"
 		self.prompt_template = None
 		self.logger = logging.getLogger(self.__class__.__name__)
+		# Keep raw data: the LLM reply and parsed dict on successful results (failures always keep raw_response),
+		# and the per-conversation scores/lists in aggregate_results output
+		self.keep_raw = False
 
 	@abstractmethod
 	def prepare_prompt_data(self, chat_json: dict[str, Any]) -> dict[str, Any]:
@@ -56,6 +66,96 @@ class BaseEvaluationTemplate(ABC):
 			Dictionary containing evaluation result
 		"""
 
+	async def evaluate_batch(
+		self,
+		conversations: list[dict[str, Any]],
+		llm_call_func,
+		client,
+		concurrency: Optional[int] = None,
+		judge_model: str = "",
+		**kwargs,
+	) -> list[dict[str, Any]]:
+		"""
+		Evaluate many conversations with overlapping LLM calls.
+
+		Args:
+			conversations: Raw conversation data, one chat_json per conversation
+			llm_call_func: Async function to call LLM with prompt
+			client: Gemini client
+			concurrency: Maximum number of in-flight evaluations (defaults to EVAL_MAX_CONCURRENT or 64)
+			judge_model: Model behind llm_call_func; part of the response cache key when TP2DG_CACHE=1
+			**kwargs: Passed through to evaluate_single (e.g. uploaded_audio_files)
+
+		Returns:
+			List of evaluation results, in the same order as conversations; a conversation whose
+			evaluation raised gets {"success": False, "error": ...}
+		"""
+		results: list[Optional[dict[str, Any]]] = [None] * len(conversations)
+		async for idx, result in self.evaluate_stream(conversations, llm_call_func, client, concurrency, judge_model, **kwargs):
+			results[idx] = result
+		return results
+
+	async def evaluate_stream(
+		self,
+		conversations: Iterable[dict[str, Any]],
+		llm_call_func,
+		client,
+		concurrency: Optional[int] = None,
+		judge_model: str = "",
+		**kwargs,
+	) -> AsyncIterator[tuple[int, dict[str, Any]]]:
+		"""
+		Evaluate conversations with overlapping LLM calls, yielding each result as soon as it is ready.
+
+		Conversations are pulled lazily, so a generator (e.g. one loading chat.json files) is never
+		read more than `concurrency` items ahead of the finished evaluations.
+
+		Args:
+			Same as evaluate_batch, except that conversations may be any iterable
+
+		Yields:
+			(index in conversations, evaluation result) tuples, in completion order
+		"""
+		# Sliding window: only `window` tasks exist at a time, so huge batches do not create one task per conversation up front
+		window = concurrency or DEFAULT_MAX_CONCURRENT
+		llm_call_func = cached_llm_call(llm_call_func, model=judge_model)
+		todo = enumerate(conversations)
+		pending = {}
+
+		def _submit() -> bool:
+			item = next(todo, None)
+			if item is None:
+				return False
+			idx, chat_json = item
+			pending[asyncio.create_task(self.evaluate_single(chat_json, llm_call_func, client, **kwargs))] = idx
+			return True
+
+		while len(pending) < window and _submit():
+			pass
+		try:
+			while pending:
+				done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					idx = pending.pop(task)
+					try:
+						result = task.result()
+					except Exception as e:
+						# One failed conversation (e.g. an API error) must not discard the rest of the batch
+						self.logger.error("Evaluation failed: %s", e)
+						result = {"success": False, "error": str(e)}
+					_submit()
+					yield idx, result
+		finally:
+			# A consumer that stops iterating early must not leave orphaned judge calls running
+			for task in pending:
+				task.cancel()
+
+	def _raw_fields(self, response: str, parsed: dict[str, Any]) -> dict[str, Any]:
+		"""Raw LLM payload for a successful result, included only when keep_raw is set."""
+		if not self.keep_raw:
+			return {}
+		return {"raw_response": response, "parsed_response": parsed}
+
 	@abstractmethod
 	def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
 		"""
@@ -5,13 +5,12 @@ This module evaluates whether the generated listener profile is appropriate/real
 given the profiling tracks, using LLM-as-a-judge with a 4-point rubric.
 """
 
-import json
 import logging
 from typing import Any, Optional
 
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
-from tp2dg.evaluation.prompts.utils import get_profiling_tracks_content
+from tp2dg.evaluation.prompts.utils import get_profiling_tracks_content, listener_profile_json, summarize_scores
 from tp2dg.prompts.prompt_template import PromptTemplate
 
 profile_appropriateness_prompt = PromptTemplate(
@@ -81,8 +80,7 @@ class ProfileAppropriatenessEvaluator(BaseEvaluationTemplate):
             uploaded_image_files = {}
 
         # Extract listener profile
-        listener_profile = chat_json["listener_profile"]
-        profile_text = json.dumps(listener_profile)
+        profile_text = listener_profile_json(chat_json)
 
         # Format tracks using their standard methods (with audio/image if available)
         profiling_tracks_content = get_profiling_tracks_content(chat_json, uploaded_audio_files, uploaded_image_files)
@@ -111,7 +109,7 @@ class ProfileAppropriatenessEvaluator(BaseEvaluationTemplate):
         # Get prompt data with uploaded files
         prompt_data = self.prepare_prompt_data(conversation_data, uploaded_audio_files, uploaded_image_files)
 
-        content = self.prompt_template.format(**prompt_data)
+        content = self.prompt_template.format_map(prompt_data)
 
         # Call LLM
         response = await llm_call_func(content, client)
@@ -131,12 +129,11 @@ class ProfileAppropriatenessEvaluator(BaseEvaluationTemplate):
             return {
                 "appropriateness_score": score,
                 "success": score > 0 and score <= 4,
-                "raw_response": response,
-                "parsed_response": parsed,
+                **self._raw_fields(response, parsed),
             }
 
         except Exception as e:
-            logging.error(f"Error parsing response: {e}")
+            logging.error("Error parsing response: %s", e)
             return {
                 "appropriateness_score": 0,
                 "success": False,
@@ -145,7 +142,10 @@ class ProfileAppropriatenessEvaluator(BaseEvaluationTemplate):
             }
 
     def aggregate_results(self, individual_results: list[dict[str, Any]]) -> dict[str, Any]:
-        """Aggregate individual results into summary statistics."""
+        """Aggregate individual results into summary statistics.
+
+        The raw per-conversation scores are only included when keep_raw is set.
+        """
 
         successful_results = [r for r in individual_results if r.get("success", False)]
 
@@ -160,17 +160,19 @@ class ProfileAppropriatenessEvaluator(BaseEvaluationTemplate):
 
         scores = [r["appropriateness_score"] for r in successful_results]
 
-        # Calculate distribution
-        score_distribution = {i: scores.count(i) for i in range(1, 5)}
+        # Calculate average and distribution
+        average_score, score_distribution = summarize_scores(scores)
 
-        return {
+        results = {
             "total_conversations": len(individual_results),
             "successful_evaluations": len(successful_results),
-            "average_score": sum(scores) / len(scores),
+            "average_score": average_score,
             "score_distribution": score_distribution,
             "success_rate": len(successful_results) / len(individual_results),
-            "scores": scores,  # For further analysis
         }
+        if self.keep_raw:
+            results["scores"] = scores  # For further analysis
+        return results
 
 
 # Create the evaluator instance for easy import
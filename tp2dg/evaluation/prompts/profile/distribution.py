@@ -9,6 +9,17 @@ from collections import Counter
 from typing import Any, Optional
 
 from tp2dg.evaluation.prompts.eval_template import BaseEvaluationTemplate
+from tp2dg.evaluation.prompts.utils import counts_to_distribution
+
+# Profile attribute -> plural used in the top_10_metrics and raw_data keys
+_PROFILE_ATTRIBUTES = {
+    "preferred_musical_culture": "preferred_musical_cultures",
+    "top_1_artist": "top_1_artists",
+    "top_1_genre": "top_1_genres",
+    "age_group": "age_groups",
+    "country": "countries",
+    "cultural_background": "cultural_backgrounds",
+}
 
 
 class ProfileDistributionEvaluator(BaseEvaluationTemplate):
@@ -83,9 +94,21 @@ class ProfileDistributionEvaluator(BaseEvaluationTemplate):
         As specified in PLAN.md: "Show the histogram / show the top 10 preferred_musical_culture"
         """
 
-        successful_results = [r for r in individual_results if r.get("success", False)]
-
-        if not successful_results:
+        # One pass counts every profile attribute; the per-result raw lists are only kept when asked for
+        attribute_counts = {attribute: Counter() for attribute in _PROFILE_ATTRIBUTES}
+        raw_values = {attribute: [] for attribute in _PROFILE_ATTRIBUTES} if self.keep_raw else None
+        total_count = 0
+        for r in individual_results:
+            if not r.get("success", False):
+                continue
+            total_count += 1
+            for attribute, counts in attribute_counts.items():
+                counts[r[attribute]] += 1
+            if raw_values is not None:
+                for attribute, values in raw_values.items():
+                    values.append(r[attribute])
+
+        if not total_count:
             return {
                 "total_conversations": len(individual_results),
                 "successful_evaluations": 0,
@@ -98,80 +121,23 @@ class ProfileDistributionEvaluator(BaseEvaluationTemplate):
                 "cultural_background_distribution": {},
             }
 
-        # Extract data for analysis
-        preferred_musical_cultures = [r["preferred_musical_culture"] for r in successful_results]
-        top_1_artists = [r["top_1_artist"] for r in successful_results]
-        top_1_genres = [r["top_1_genre"] for r in successful_results]
-        age_groups = [r["age_group"] for r in successful_results]
-        countries = [r["country"] for r in successful_results]
-        cultural_backgrounds = [r["cultural_background"] for r in successful_results]
-
-        # Compute distributions (counts and percentages)
-        total_count = len(successful_results)
-
-        def create_distribution(values):
-            counts = Counter(values)
-            return {
-                value: {
-                    "count": count,
-                    "percentage": (count / total_count) * 100,
-                }
-                for value, count in counts.items()
-            }
-
-        # Create distributions for all profile attributes
-        preferred_musical_culture_distribution = create_distribution(preferred_musical_cultures)
-        top_1_artist_distribution = create_distribution(top_1_artists)
-        top_1_genre_distribution = create_distribution(top_1_genres)
-        age_group_distribution = create_distribution(age_groups)
-        country_distribution = create_distribution(countries)
-        cultural_background_distribution = create_distribution(cultural_backgrounds)
-
-        # Compute diversity metrics (number of unique values)
-        diversity_metrics = {
-            "preferred_musical_culture_diversity": len(set(preferred_musical_cultures)),
-            "top_1_artist_diversity": len(set(top_1_artists)),
-            "top_1_genre_diversity": len(set(top_1_genres)),
-            "age_group_diversity": len(set(age_groups)),
-            "country_diversity": len(set(countries)),
-            "cultural_background_diversity": len(set(cultural_backgrounds)),
-        }
-
-        # Get top 10 most common values for each attribute
-        def get_top_10(values):
-            counts = Counter(values)
-            return counts.most_common(10)
-
-        top_10_metrics = {
-            "top_10_preferred_musical_cultures": get_top_10(preferred_musical_cultures),
-            "top_10_top_1_artists": get_top_10(top_1_artists),
-            "top_10_top_1_genres": get_top_10(top_1_genres),
-            "top_10_age_groups": get_top_10(age_groups),
-            "top_10_countries": get_top_10(countries),
-            "top_10_cultural_backgrounds": get_top_10(cultural_backgrounds),
-        }
-
-        return {
+        results = {
             "total_conversations": len(individual_results),
-            "successful_evaluations": len(successful_results),
-            "success_rate": len(successful_results) / len(individual_results),
-            "preferred_musical_culture_distribution": preferred_musical_culture_distribution,
-            "top_1_artist_distribution": top_1_artist_distribution,
-            "top_1_genre_distribution": top_1_genre_distribution,
-            "age_group_distribution": age_group_distribution,
-            "country_distribution": country_distribution,
-            "cultural_background_distribution": cultural_background_distribution,
-            "diversity_metrics": diversity_metrics,
-            "top_10_metrics": top_10_metrics,
-            "raw_data": {
-                "preferred_musical_cultures": preferred_musical_cultures,
-                "top_1_artists": top_1_artists,
-                "top_1_genres": top_1_genres,
-                "age_groups": age_groups,
-                "countries": countries,
-                "cultural_backgrounds": cultural_backgrounds,
-            },
+            "successful_evaluations": total_count,
+            "success_rate": total_count / len(individual_results),
+        }
+        # Distributions (counts and percentages) for all profile attributes
+        for attribute, counts in attribute_counts.items():
+            results[f"{attribute}_distribution"] = counts_to_distribution(counts, total_count)
+        # Diversity metrics (number of unique values)
+        results["diversity_metrics"] = {f"{attribute}_diversity": len(counts) for attribute, counts in attribute_counts.items()}
+        # Top 10 most common values for each attribute
+        results["top_10_metrics"] = {
+            f"top_10_{plural}": attribute_counts[attribute].most_common(10) for attribute, plural in _PROFILE_ATTRIBUTES.items()
         }
+        if raw_values is not None:
+            results["raw_data"] = {_PROFILE_ATTRIBUTES[attribute]: values for attribute, values in raw_values.items()}
+        return results
 
 
 # Create the evaluator instance for easy import
@@ -2,10 +2,42 @@
 Utility functions for conversation evaluation.
 """
 
-from typing import Any
+import json
+from collections import Counter
+from typing import Any, Callable, Iterable
 
 from tp2dg.entities.track import Track, Tracks
 
+# Keys under which the *_json helpers memoize their results on a PreparedConversation
+_TURNS_JSON_KEY = "conversation_turns_json"
+_GOAL_JSON_KEY = "conversation_goal_json"
+_PROFILE_JSON_KEY = "listener_profile_json"
+_TRACKS_KEY_PREFIX = "tracks_"
+
+
+class PreparedConversation(dict):
+    """
+    A conversation's chat_json together with the renderings shared by its evaluators.
+
+    It holds the same items as the chat_json it is built from, so evaluators read it like chat_json.
+    The turns/goal/profile JSON and session Tracks are computed on first use and kept in memo,
+    apart from the data, so the caller's chat_json is never modified and the items stay serializable.
+    Build one per conversation and pass it to every evaluator; plain dicts work too, without memoization.
+    """
+
+    def __init__(self, chat_json: dict[str, Any]):
+        super().__init__(chat_json)
+        self.memo: dict[str, Any] = {}
+
+
+def _memoized(chat_json: dict[str, Any], key: str, build: Callable[[], Any]) -> Any:
+    if not isinstance(chat_json, PreparedConversation):
+        return build()
+    value = chat_json.memo.get(key)
+    if value is None:
+        value = chat_json.memo[key] = build()
+    return value
+
 
 def extract_conversation_turns(chat_json: dict[str, Any]) -> list[dict[str, Any]]:
     """
@@ -53,6 +85,91 @@ def extract_conversation_turns(chat_json: dict[str, Any]) -> list[dict[str, Any]
     return turns
 
 
+def conversation_turns_json(chat_json: dict[str, Any]) -> str:
+    """
+    Serialize the extracted conversation turns, once per PreparedConversation.
+
+    Several evaluators embed the same turns JSON in their prompts, so the first call
+    stores it in the conversation's memo and later calls reuse it.
+
+    Args:
+        chat_json: The chat.json data containing conversation information
+
+    Returns:
+        JSON string of the turns returned by extract_conversation_turns
+    """
+    return _memoized(chat_json, _TURNS_JSON_KEY, lambda: json.dumps(extract_conversation_turns(chat_json)))
+
+
+def conversation_goal_json(chat_json: dict[str, Any], indent: int | None = None) -> str:
+    """
+    Serialize the conversation goal, once per PreparedConversation and indent.
+
+    Args:
+        chat_json: The chat.json data containing conversation information
+        indent: Passed to json.dumps (plausibility embeds the goal pretty-printed)
+
+    Returns:
+        JSON string of chat_json["conversation_goal"]
+    """
+    cache_key = _GOAL_JSON_KEY if indent is None else f"{_GOAL_JSON_KEY}_{indent}"
+    return _memoized(chat_json, cache_key, lambda: json.dumps(chat_json["conversation_goal"], indent=indent))
+
+
+def listener_profile_json(chat_json: dict[str, Any]) -> str:
+    """
+    Serialize the listener profile, once per PreparedConversation.
+
+    Args:
+        chat_json: The chat.json data containing conversation information
+
+    Returns:
+        JSON string of chat_json["listener_profile"]
+    """
+    return _memoized(chat_json, _PROFILE_JSON_KEY, lambda: json.dumps(chat_json["listener_profile"]))
+
+
+def summarize_scores(scores: list[int]) -> tuple[float, dict[int, int]]:
+    """
+    Compute the average and the 1-4 distribution of a non-empty score list in one pass.
+
+    Args:
+        scores: Scores of the successful evaluations for one metric
+
+    Returns:
+        Tuple of (average score, {score: count for score in 1..4})
+    """
+    counts = Counter()
+    total = 0
+    for score in scores:
+        counts[score] += 1
+        total += score
+    return total / len(scores), {i: counts.get(i, 0) for i in range(1, 5)}
+
+
+def counts_to_distribution(
+    counts: dict[Any, int],
+    total: int,
+    labels: Iterable[Any] | None = None,
+) -> dict[Any, dict[str, float]]:
+    """
+    Turn label counts into the {"count", "percentage"} entries of the distribution reports.
+
+    Args:
+        counts: Count per label (e.g. a Counter)
+        total: Number of results the percentages are relative to
+        labels: Labels to report, in order, with missing ones counted as 0; defaults to the keys of counts
+
+    Returns:
+        Dictionary mapping each label to its count and its percentage of total
+    """
+    distribution = {}
+    for label in counts if labels is None else labels:
+        count = counts.get(label, 0)
+        distribution[label] = {"count": count, "percentage": count / total * 100}
+    return distribution
+
+
 def extract_goal_progress_assessments(chat_json: dict[str, Any]) -> list[dict[str, Any]]:
     """
     Extract goal progress assessments from listener turns.
@@ -80,14 +197,32 @@ def extract_goal_progress_assessments(chat_json: dict[str, Any]) -> list[dict[st
     return assessments
 
 
+def session_tracks(chat_json: dict[str, Any], context_key: str) -> Tracks:
+    """
+    Build the Tracks of one session_context list, once per PreparedConversation.
+
+    Reusing the same Track objects across evaluators also reuses their memoized prompt strings.
+
+    Args:
+        chat_json: The chat.json data containing conversation information
+        context_key: Key under chat_json["session_context"], e.g. "recommendation_pool_tracks"
+
+    Returns:
+        Tracks built from the track dicts under that key
+    """
+    return _memoized(
+        chat_json,
+        _TRACKS_KEY_PREFIX + context_key,
+        lambda: Tracks([Track.from_dict(track) for track in chat_json["session_context"][context_key]]),
+    )
+
+
 def get_recommended_tracks_content(
     chat_json: dict[str, Any],
     uploaded_audio_files: dict[str, Any],
     uploaded_image_files: dict[str, Any],
 ) -> str:
-    session_context = chat_json["session_context"]
-    recommended_tracks_data = session_context["recommendation_pool_tracks"]
-    recommended_tracks = Tracks([Track.from_dict(track) for track in recommended_tracks_data])
+    recommended_tracks = session_tracks(chat_json, "recommendation_pool_tracks")
 
     recommended_tracks_content = recommended_tracks.prompt_str_with_artifacts(
         tracks_title="## RECOMMENDED TRACKS:\n",
@@ -108,9 +243,7 @@ def get_profiling_tracks_content(
     uploaded_audio_files: dict[str, Any],
     uploaded_image_files: dict[str, Any],
 ) -> str:
-    session_context = chat_json["session_context"]
-    profiling_tracks_data = session_context["listener_tracks"]
-    profiling_tracks = Tracks([Track.from_dict(track) for track in profiling_tracks_data])
+    profiling_tracks = session_tracks(chat_json, "listener_tracks")
 
     profiling_tracks_content = profiling_tracks.prompt_str_with_artifacts(
         tracks_title="## PROFILING TRACKS (Previously liked by listener):\n",
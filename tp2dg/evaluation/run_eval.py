@@ -1,11 +1,15 @@
 import argparse
+import asyncio
+import concurrent.futures
+import itertools
 import json
 import os
-from collections import Counter, defaultdict
-from glob import glob
-
-from google import genai
+import re
+from collections import Counter, defaultdict, deque
 
+from tp2dg.clients import shared_client
+from tp2dg.components.cache import cached_call
+from tp2dg.components.rate_limit import API_RATE_LIMITER, call_with_retries
 from tp2dg.components.utils import robust_parse_yaml_response
 from tp2dg.evaluation.prompts.conversation_goal.plausibility import (
 	conversation_goal_plausibility_evaluator,
@@ -16,60 +20,109 @@ from tp2dg.evaluation.prompts.conversation_element.goal_progress_assessment impo
 	goal_progress_assessment_evaluator,
 )
 from tp2dg.evaluation.prompts.conversation_element.track_id import track_id_evaluator
+from tp2dg.evaluation.prompts.utils import PreparedConversation
+
+_FIRST_SCORE_RE = re.compile(r"[1-4]")
+# Shared read-only default for missing listener/recsys entries
+_EMPTY: dict = {}
+# Per-key "key: <1-4>" line patterns, compiled on first use
+_SCORE_RES: dict[str, re.Pattern] = {}
 
 
 def parse_args():
 	p = argparse.ArgumentParser(description="Run LLM-as-a-judge evaluation over generated conversations")
 	p.add_argument("--input", required=True, help="Root folder with generated conversations")
 	p.add_argument("--model", default="gemini-2.5-flash")
+	p.add_argument("--concurrency", type=int, default=16, help="Maximum number of judge calls in flight")
+	p.add_argument("--api-delay", type=float, default=0.0, help="Minimum seconds between judge requests (0 disables rate limiting)")
 	return p.parse_args()
 
 
-def load_conversations(root: str):
-	for chat_path in glob(os.path.join(root, "**", "chat.json"), recursive=True):
-		base = os.path.dirname(chat_path)
-		with open(chat_path, "r", encoding="utf-8") as f:
-			chat_list = json.load(f)
-		goal = {}
-		profile = {}
+def _load_conversation(chat_path: str) -> dict:
+	base = os.path.dirname(chat_path)
+	with open(chat_path, "r", encoding="utf-8") as f:
+		chat_list = json.load(f)
+	goal = {}
+	profile = {}
+	try:
+		with open(os.path.join(base, "conversation_goal.json"), "r", encoding="utf-8") as f:
+			goal = json.load(f)
+		with open(os.path.join(base, "profiling.json"), "r", encoding="utf-8") as f:
+			profile = json.load(f)
+	except Exception:
+		pass
+	return {"chat_list": chat_list, "goal": goal, "profile": profile, "base": base}
+
+
+def find_chat_files(root: str):
+	for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+		# Like glob's "**": follow symlinked directories and skip hidden ones; dunder directories (__pycache__) are pruned too
+		dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
+		if "chat.json" in filenames:
+			yield os.path.join(dirpath, "chat.json")
+
+
+def load_conversations(root: str, max_workers: int = 8):
+	# Each conversation is three small file reads; a few threads overlap their I/O. Paths come lazily from the walk
+	# and at most max_workers reads run ahead of the consumer, so the corpus is never all in memory at once
+	chat_paths = find_chat_files(root)
+	with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="load-conversation") as executor:
+		reads = deque(executor.submit(_load_conversation, path) for path in itertools.islice(chat_paths, max_workers))
 		try:
-			with open(os.path.join(base, "conversation_goal.json"), "r", encoding="utf-8") as f:
-				goal = json.load(f)
-			with open(os.path.join(base, "profiling.json"), "r", encoding="utf-8") as f:
-				profile = json.load(f)
-		except Exception:
-			pass
-		yield {"chat_list": chat_list, "goal": goal, "profile": profile, "base": base}
+			while reads:
+				convo = reads.popleft().result()
+				for path in itertools.islice(chat_paths, 1):
+					reads.append(executor.submit(_load_conversation, path))
+				yield convo
+		finally:
+			for future in reads:
+				future.cancel()
+
+
+@cached_call("evaluation")
+def generate(client, *, model: str, contents):
+	# Judge calls are deterministic per prompt, so reruns with TP2DG_CACHE=1 reuse earlier verdicts
+	# Shares the process-wide rate limiter and retries 429/5xx with jittered backoff, like the generation components
+	return call_with_retries(lambda: client.models.generate_content(model=model, contents=contents))
 
 
 def to_score(text: str, key: str) -> int:
+	pattern = _SCORE_RES.get(key)
+	if pattern is None:
+		pattern = _SCORE_RES[key] = re.compile(rf"^[ \t]*{re.escape(key)}[ \t]*:[ \t]*[\"']?([1-4])[\"']?[ \t]*$", re.MULTILINE)
+	# Well-formed judge replies carry the score on its own line; anything else goes through the full parser
+	m = pattern.search(text)
+	if m:
+		return int(m.group(1))
 	parsed = robust_parse_yaml_response(text, [key])
 	val = parsed.get(key)
 	try:
 		return int(val)
 	except Exception:
 		# fallback: first digit
-		for ch in str(text):
-			if ch in "1234":
-				return int(ch)
+		m = _FIRST_SCORE_RE.search(str(text))
+		if m:
+			return int(m.group())
 	return 0
 
 
 def adapt_to_eval_structure(chat_list: list, goal: dict, profile: dict) -> dict:
 	conversation_turns = []
 	for item in chat_list:
+		listener = item.get("listener", _EMPTY)
+		recsys = item.get("recsys", _EMPTY)
 		conversation_turns.append(
 			{
 				"turn_number": item.get("turn", 0),
 				"listener_turn": {
-					"thought": item.get("listener", {}).get("thought", ""),
-					"message": item.get("listener", {}).get("message", ""),
-					"goal_progress_assessment": item.get("listener", {}).get("goal_progress_assessment", ""),
+					"thought": listener.get("thought", ""),
+					"message": listener.get("message", ""),
+					"goal_progress_assessment": listener.get("goal_progress_assessment", ""),
 				},
 				"recsys_turn": {
-					"thought": item.get("recsys", {}).get("thought", ""),
-					"message": item.get("recsys", {}).get("message", ""),
-					"track": item.get("recsys", {}).get("track", None),
+					"thought": recsys.get("thought", ""),
+					"message": recsys.get("message", ""),
+					"track": recsys.get("track", None),
 				},
 			}
 		)
@@ -78,69 +131,141 @@ def adapt_to_eval_structure(chat_list: list, goal: dict, profile: dict) -> dict:
 		"recommendation_pool_tracks": [],
 		"listener_tracks": [],
 	}
-	return {
-		"conversation_turns": conversation_turns,
-		"conversation_goal": goal or {},
-		"listener_profile": profile.get("summary", {}),
-		"session_context": session_context,
-	}
+	# One PreparedConversation per conversation lets the five judges share its turns/goal renderings
+	return PreparedConversation(
+		{
+			"conversation_turns": conversation_turns,
+			"conversation_goal": goal or {},
+			"listener_profile": profile.get("summary", {}),
+			"session_context": session_context,
+		}
+	)
 
 
-def main():
-	args = parse_args()
-	client = genai.Client()
-	model = args.model
+def build_judge_prompts(chat_json: dict, goal: dict) -> list:
+	"""Judge prompts for one conversation, each paired with the (metric, response field) scores read from its reply."""
+	prompts = []
+
+	# Goal plausibility (if goal available)
+	if goal:
+		pd = conversation_goal_plausibility_evaluator.prepare_prompt_data(chat_json, {}, {})
+		contents = conversation_goal_plausibility_evaluator.prompt_template.format_map(pd)
+		prompts.append((contents, [("goal_plausibility", "plausibility_score")]))
+
+	# Profile appropriateness (if profile available) - reuse message evaluator's listener_quality_score as proxy is not right.
+	# Skipping explicit profile judge since dataset lacks per-track profiling context here.
+
+	# Listener goal progress label accuracy; one prompt covers every turn's label, so it is judged once per conversation
+	if chat_json["conversation_turns"]:
+		pd = goal_progress_assessment_evaluator.prepare_prompt_data(chat_json, {}, {})
+		contents = goal_progress_assessment_evaluator.prompt_template.format_map(pd)
+		prompts.append((contents, [("listener_progress_label", "accuracy_score")]))
+
+	# Thought quality (listener/recsys)
+	pd = thought_evaluator.prepare_prompt_data(chat_json)
+	contents = thought_evaluator.prompt_template.format_map(pd)
+	prompts.append(
+		(
+			contents,
+			[
+				("listener_thought_quality", "listener_coherence_score"),
+				("recsys_thought_quality", "recsys_coherence_score"),
+			],
+		)
+	)
 
+	# Message quality and alignment (listener/recsys)
+	pd = message_evaluator.prepare_prompt_data(chat_json, {}, {})
+	contents = message_evaluator.prompt_template.format_map(pd)
+	prompts.append(
+		(
+			contents,
+			[
+				("listener_message_quality", "listener_quality_score"),
+				("recsys_message_quality", "recsys_quality_score"),
+				("listener_message_helpfulness", "listener_helpfulness_score"),
+				("recsys_message_alignment", "recsys_accuracy_score"),
+			],
+		)
+	)
+
+	# Track_id recommendation quality (evaluate first turn only to reduce cost)
+	pd = track_id_evaluator.prepare_prompt_data(chat_json, {}, {})
+	contents = track_id_evaluator.prompt_template.format_map(pd)
+	prompts.append((contents, [("recsys_track_quality", "recommendation_score")]))
+
+	return prompts
+
+
+async def score_conversation(client, model: str, prompts: list, semaphore: asyncio.Semaphore) -> list:
+	async def judge(contents):
+		# The semaphore bounds in-flight judge calls across all conversations to respect the model's rate limits
+		async with semaphore:
+			return await asyncio.to_thread(generate, client, model=model, contents=contents)
+
+	responses = await asyncio.gather(*(judge(contents) for contents, _ in prompts))
+	return [(metric, to_score(resp.text, field)) for resp, (_, fields) in zip(responses, prompts) for metric, field in fields]
+
+
+async def evaluate_conversation(client, model: str, convo: dict, semaphore: asyncio.Semaphore) -> list:
+	chat_json = adapt_to_eval_structure(convo["chat_list"], convo["goal"], convo["profile"])
+	prompts = build_judge_prompts(chat_json, convo["goal"])
+	return await score_conversation(client, model, prompts, semaphore)
+
+
+async def evaluate_all(client, model: str, root: str, concurrency: int) -> tuple[dict, int]:
+	semaphore = asyncio.Semaphore(concurrency)
+	# Sliding window, as in BaseEvaluationTemplate.evaluate_stream: conversations are loaded and their prompts
+	# built only as earlier ones finish, so a large input never holds every prompt in memory at once
+	conversations = load_conversations(root)
+	todo = enumerate(conversations)
+	pending = {}
+	results = {}
+	failed = 0
+
+	async def _submit() -> bool:
+		# Pulling the next conversation waits on file reads, so it runs off the event loop
+		item = await asyncio.to_thread(next, todo, None)
+		if item is None:
+			return False
+		idx, convo = item
+		pending[asyncio.create_task(evaluate_conversation(client, model, convo, semaphore))] = (idx, convo["base"])
+		return True
+
+	try:
+		while len(pending) < concurrency and await _submit():
+			pass
+		while pending:
+			done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+			for task in done:
+				idx, base = pending.pop(task)
+				try:
+					results[idx] = task.result()
+				except Exception as e:
+					# One failed conversation (e.g. an API error) must not discard the rest of the run
+					print(f"Evaluation failed for {base}: {e}")
+					failed += 1
+				await _submit()
+	finally:
+		for task in pending:
+			task.cancel()
+		conversations.close()
+
+	# Scores are folded in conversation order, so the metric order matches a sequential run
 	metrics = defaultdict(Counter)
+	for idx in sorted(results):
+		for metric, score in results[idx]:
+			metrics[metric][score] += 1
+	return metrics, failed
+
+
+def main():
+	args = parse_args()
+	if args.api_delay > 0:
+		API_RATE_LIMITER.configure(rate_per_sec=1.0 / args.api_delay)
+	client = shared_client()
 
-	for convo in load_conversations(args.input):
-		chat_list = convo["chat_list"]
-		goal = convo["goal"]
-		profile = convo["profile"]
-
-		chat_json = adapt_to_eval_structure(chat_list, goal, profile)
-
-		# Goal plausibility (if goal available)
-		if goal:
-			pd = conversation_goal_plausibility_evaluator.prepare_prompt_data(chat_json, {}, {})
-			contents = conversation_goal_plausibility_evaluator.prompt_template.format(**pd)
-			resp = client.models.generate_content(model=model, contents=contents)
-			s = to_score(resp.text, "plausibility_score")
-			metrics["goal_plausibility"][s] += 1
-
-		# Profile appropriateness (if profile available) - reuse message evaluator's listener_quality_score as proxy is not right.
-		# Skipping explicit profile judge since dataset lacks per-track profiling context here.
-
-		# Listener goal progress label accuracy per turn
-		for turn in chat_json["conversation_turns"]:
-			pd = goal_progress_assessment_evaluator.prepare_prompt_data(chat_json, {}, {})
-			contents = goal_progress_assessment_evaluator.prompt_template.format(**pd)
-			resp = client.models.generate_content(model=model, contents=contents)
-			s = to_score(resp.text, "accuracy_score")
-			metrics["listener_progress_label"][s] += 1
-			break  # evaluate once per conversation to reduce cost
-
-		# Thought quality (listener/recsys)
-		pd = thought_evaluator.prepare_prompt_data(chat_json)
-		contents = thought_evaluator.prompt_template.format(**pd)
-		resp = client.models.generate_content(model=model, contents=contents)
-		metrics["listener_thought_quality"][to_score(resp.text, "listener_coherence_score")] += 1
-		metrics["recsys_thought_quality"][to_score(resp.text, "recsys_coherence_score")] += 1
-
-		# Message quality and alignment (listener/recsys)
-		pd = message_evaluator.prepare_prompt_data(chat_json, {}, {})
-		contents = message_evaluator.prompt_template.format(**pd)
-		resp = client.models.generate_content(model=model, contents=contents)
-		metrics["listener_message_quality"][to_score(resp.text, "listener_quality_score")] += 1
-		metrics["recsys_message_quality"][to_score(resp.text, "recsys_quality_score")] += 1
-		metrics["listener_message_helpfulness"][to_score(resp.text, "listener_helpfulness_score")] += 1
-		metrics["recsys_message_alignment"][to_score(resp.text, "recsys_accuracy_score")] += 1
-
-		# Track_id recommendation quality (evaluate first turn only to reduce cost)
-		pd = track_id_evaluator.prepare_prompt_data(chat_json, {}, {})
-		contents = track_id_evaluator.prompt_template.format(**pd)
-		resp = client.models.generate_content(model=model, contents=contents)
-		metrics["recsys_track_quality"][to_score(resp.text, "recommendation_score")] += 1
+	metrics, failed = asyncio.run(evaluate_all(client, args.model, args.input, args.concurrency))
 
 	# Print distributions
 	for k, counter in metrics.items():
@@ -148,6 +273,8 @@ def main():
 		avg = (sum(score * count for score, count in counter.items()) / total) if total else 0
 		dist = ", ".join(f"{s}:{counter.get(s,0)}" for s in [1, 2, 3, 4])
 		print(f"{k}: avg={avg:.2f}/4, dist=({dist}), n={total}")
+	if failed:
+		print(f"failed conversations: {failed}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 import argparse
+import collections
+import concurrent.futures
+import itertools
 import json
 import os
-from glob import glob
 
 
 def parse_args():
@@ -10,14 +12,37 @@ def parse_args():
     return p.parse_args()
 
 
-def load_chats(root: str):
-    pattern = os.path.join(root, "**", "chat.json")
-    for path in glob(pattern, recursive=True):
+def _read_chat(path: str):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return path, json.load(f)
+    except Exception:
+        return None
+
+
+def find_chat_files(root: str):
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        # Like glob's "**": follow symlinked directories and skip hidden ones; dunder directories (__pycache__) are pruned too
+        dirnames[:] = [d for d in dirnames if not d.startswith((".", "__"))]
+        if "chat.json" in filenames:
+            yield os.path.join(dirpath, "chat.json")
+
+
+def load_chats(root: str, max_workers: int = 8):
+    # Reads overlap across a few threads, in walk order; at most max_workers of them run ahead of the consumer
+    chat_paths = find_chat_files(root)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="load-chat") as executor:
+        reads = collections.deque(executor.submit(_read_chat, path) for path in itertools.islice(chat_paths, max_workers))
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                yield path, json.load(f)
-        except Exception:
-            continue
+            while reads:
+                loaded = reads.popleft().result()
+                for path in itertools.islice(chat_paths, 1):
+                    reads.append(executor.submit(_read_chat, path))
+                if loaded is not None:
+                    yield loaded
+        finally:
+            for future in reads:
+                future.cancel()
 
 
 def main():
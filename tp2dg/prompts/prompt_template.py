@@ -1,6 +1,29 @@
+import string
 from dataclasses import dataclass
 
 
+def _compile_template(template: str):
+	"""Specialize `template.format_map` into generated code so the template is parsed once, not per call.
+
+	Returns None for templates using positional, indexed/attribute or nested-spec fields; callers fall back to str.format_map.
+	"""
+	parts = []
+	for literal, field, spec, conversion in string.Formatter().parse(template):
+		if literal:
+			parts.append(repr(literal))
+		if field is None:
+			continue
+		if not field.isidentifier() or "{" in spec:
+			return None
+		value = f"data[{field!r}]"
+		if conversion:
+			value = f"{ {'r': 'repr', 's': 'str', 'a': 'ascii'}[conversion]}({value})"
+		parts.append(f"format({value}, {spec!r})")
+	namespace = {}
+	exec(f"def _render(data):\n\treturn ''.join(({', '.join(parts)},))", namespace)
+	return namespace["_render"]
+
+
 @dataclass
 class PromptTemplate:
 	"""A template for prompts with versioning and parameter substitution."""
@@ -19,14 +42,22 @@ class PromptTemplate:
 		if self.response_expected_fields is None:
 			self.response_expected_fields = []
 
+		self._render = _compile_template(self.template) or self.template.format_map
+		self._required = frozenset(self.required_params)
+
 	def format(self, **kwargs) -> str:
 		"""Format the template with provided parameters."""
-		missing_params = [param for param in self.required_params if param not in kwargs]
-		if missing_params:
+		return self.format_map(kwargs)
+
+	def format_map(self, data: dict) -> str:
+		"""Format the template from a mapping, without unpacking it into keyword arguments."""
+		# One membership test per required param, against the precomputed set
+		if not data.keys() >= self._required:
+			missing_params = [param for param in self.required_params if param not in data]
 			raise ValueError(f"Missing required parameters: {missing_params}")
 
-		return self.template.format(**kwargs)
+		return self._render(data)
 
 	def is_success(self, parsed_response: dict) -> bool:
 		"""Check if the response is successful."""
-		return all(key in parsed_response for key in self.response_expected_fields) 
\ No newline at end of file
+		return all(key in parsed_response for key in self.response_expected_fields)